@@ -26,6 +26,21 @@ class ComponentNamer(object):
 
         return cpt_kind + name_kind + str(foo[cpt_kind])
     
+    def reserve(self, cpt_kind, name, name_kind='anon'):
+        """Ensure that the name `name` of an existing component is not
+        created again."""
+
+        suffix = cpt_kind + name_kind
+        index = name.rfind(suffix)
+        if index < 0:
+            return
+        number = name[index + len(suffix):]
+        if not number.isdigit():
+            return
+
+        foo = self.names.setdefault(name_kind, {})
+        foo[cpt_kind] = max(foo.get(cpt_kind, 0), int(number))
+
     def __call__(self, cpt_kind, name_kind='anon'):
         """Create component name based on `cpt_kind` (`R`, `L`, etc.)
         and the name_kind (`anon`, `t`, etc)."""
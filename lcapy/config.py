@@ -40,7 +40,8 @@ words = ('alpha', 'beta', 'gamma', 'delta', 'eta', 'zeta', 'theta',
          'iota', 'kappa', 'mu', 'nu', 'omicron', 'pi', 'rho', 'sigma', 'tau',
          'upsilon', 'omega')
 
-# Can be 'GE', 'LU', 'ADJ', 'LDL', 'CH', 'DM-GE', 'DM-LU', 'DM-charpoly'
+# Can be 'GE', 'LU', 'ADJ', 'LDL', 'CH', 'DM-GE', 'DM-LU', 'DM-charpoly',
+# or 'auto'.  The latter chooses the method based on the matrix.
 # Note, the DM methods require the git version of sympy otherwise
 # the fallback method is used.
 try:
@@ -51,3 +52,20 @@ except:
     
 matrix_inverse_fallback_method = 'ADJ'
 
+# Time limit in seconds for each method tried by the 'auto' matrix
+# inverse method before trying the next one.  None for no limit.
+matrix_inverse_timeout = None
+
+# Can be 'DM-bareiss' or one of the matrix inverse methods (including
+# 'auto').  The former solves the MNA equations over a polynomial ring
+# using fraction-free elimination; this only needs SymPy's domain
+# construction and falls back on matrix_inverse_method if the matrix
+# elements cannot be represented exactly.  Use 'default' for
+# matrix_inverse_method.
+matrix_solve_method = 'DM-bareiss'
+
+# If True, the unknowns internal to each namespace (say for a
+# subcircuit included with .include file as name) are eliminated
+# before solving the MNA equations and the reduced blocks are cached
+# so that repeated subcircuits are only reduced once.
+namespace_reduction = False
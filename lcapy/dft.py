@@ -18,6 +18,7 @@ __all__ = ('DFT', 'IDFT', 'DFTmatrix', 'IDFTmatrix')
 
 
 discrete_fourier_cache = {}
+dft_matrix_cache = {}
 
 
 def discrete_fourier_sympy(expr, n, k, N):
@@ -226,24 +227,35 @@ def IDFT(expr, k, n, N, **assumptions):
 def DFTmatrix(N):
     """Return DFT matrix of size `N` x `N`."""    
 
-    w = exp(-j * 2 * pi / N)
-
-    a = Matrix.zeros(N)
-    
-    for row in range(N):
-        for col in range(N):
-            a[row, col] = w ** (row * col)
-    return a
+    return _dft_matrix(N, inverse=False)
 
 
 def IDFTmatrix(N):
     """Return inverse DFT matrix of size `N` x `N`."""
 
-    w = exp(j * 2 * pi / N)
+    return _dft_matrix(N, inverse=True)
 
-    a = Matrix.zeros(N)
-    
-    for row in range(N):
-        for col in range(N):
-            a[row, col] = w ** (row * col)
-    return a / N
+
+def _dft_matrix(N, inverse=False):
+    """Return DFT matrix or inverse DFT matrix.  The elements are
+    powers of the N-th roots of unity and since these are periodic,
+    only N distinct elements are required.  The matrices are cached
+    since they are expensive to create; a copy is returned so that
+    the cached matrix cannot be modified."""
+
+    key = (N, bool(inverse))
+    if key in dft_matrix_cache:
+        return dft_matrix_cache[key].copy()
+
+    if inverse:
+        w = sym.exp(j * 2 * pi / N)
+    else:
+        w = sym.exp(-j * 2 * pi / N)
+
+    roots = [w ** m for m in range(N)]
+    a = Matrix(N, N, lambda row, col: roots[(row * col) % N])
+    if inverse:
+        a = a / N
+
+    dft_matrix_cache[key] = a
+    return a.copy()
@@ -6,17 +6,27 @@ Copyright 2020 Michael Hayes, UCECE
 """
 
 class EquipotentialNodes(dict):
+    """Dictionary of lists of nodes of the same potential keyed by a
+    representative node.  The representative of each node is
+    remembered so that wires can be added without searching the
+    groups.  When two groups are merged, the smaller group is moved
+    into the larger one (weighted union-find)."""
+
+    def __init__(self):
+
+        super(EquipotentialNodes, self).__init__()
+        self.node_keys = {}
 
     def add(self, nodenames):
         for key in nodenames:
+            if key in self.node_keys:
+                continue
             self[key] = [key]
+            self.node_keys[key] = key
 
     def find_key(self, n):
 
-        for key, nodes in self.items():
-            if n in nodes:
-                return key
-        return None
+        return self.node_keys.get(n, None)
 
     def add_wire(self, n1, n2):
 
@@ -27,14 +37,27 @@ class EquipotentialNodes(dict):
             return
 
         if key1 != key2:
+            if len(self[key1]) < len(self[key2]):
+                key1, key2 = key2, key1
             # Merge equipotential nodes.
-            self[key1].extend(self.pop(key2))
+            nodes = self.pop(key2)
+            for node in nodes:
+                self.node_keys[node] = key1
+            self[key1].extend(nodes)
 
     def add_wires(self, nodes):
 
-        # Iterate over all pairs.
-        for i in range(len(nodes)):
-            for m in range(i + 1, len(nodes)):
-                self.add_wire(nodes[i], nodes[m])
-            
+        # Nodes are connected transitively so only need to connect
+        # the first node to the others.
+        for m in range(1, len(nodes)):
+            self.add_wire(nodes[0], nodes[m])
+
+    def add_cpt(self, cpt):
+        """Add the connections of component cpt; this assumes its nodes
+        have been added."""
 
+        if cpt.type == 'W':
+            self.add_wire(*cpt.nodenames)
+        else:
+            for connections in cpt.equipotential_nodes:
+                self.add_wires([cpt.name + '.' + n for n in connections])
@@ -1117,6 +1117,9 @@ class Expr(ExprPrint, ExprMisc):
             def unitimpulse(arg):
                 return 1.0 if arg == 0 else 0.0            
 
+            def unitstep(arg):
+                return 1.0 if arg >= 0 else 0.0
+
             def heaviside(arg):
                 return 1.0 if arg >= 0.0 else 0.0
 
@@ -1143,6 +1146,7 @@ class Expr(ExprPrint, ExprMisc):
                             ({'DiracDelta' : dirac,
                               'Heaviside' : heaviside,
                               'UnitImpulse' : unitimpulse,
+                              'UnitStep' : unitstep,
                               'sqrt' : sqrt, 'exp' : exp},
                              "scipy", "numpy", "math", "sympy"))
 
@@ -1522,34 +1526,42 @@ class Expr(ExprPrint, ExprMisc):
             rootslist += [expr(root)] * n        
         return expr(rootslist)        
     
-    def roots(self, aslist=False):
+    def roots(self, aslist=False, numeric=False):
         """Return roots of expression as a dictionary
-        Note this may not find them all."""
+        Note this may not find them all.
+
+        If numeric is True, the roots are found numerically."""
 
         if self._ratfun is None:
             roots = {}
         else:
-            roots = self._ratfun.roots()
+            roots = self._ratfun.roots(numeric)
         return self._fmt_roots(roots, aslist)        
             
-    def zeros(self, aslist=False):
+    def zeros(self, aslist=False, numeric=False):
         """Return zeroes of expression as a dictionary
-        Note this may not find them all."""
+        Note this may not find them all.
+
+        If numeric is True, the zeros are found numerically."""
 
         if self._ratfun is None:
             zeros = {}
         else:
-            zeros = self._ratfun.zeros()
+            zeros = self._ratfun.zeros(numeric)
         return self._fmt_roots(zeros, aslist)        
 
-    def poles(self, aslist=False, damping=None):
+    def poles(self, aslist=False, damping=None, numeric=False):
         """Return poles of expression as a dictionary
-        Note this may not find them all."""
+        Note this may not find them all.
+
+        If numeric is True, the poles are found numerically.  This is
+        much faster for high order denominators but requires the
+        coefficients to be numbers."""
 
         if self._ratfun is None:
             return self._fmt_roots({}, aslist)            
         
-        poles = self._ratfun.poles(damping=damping)
+        poles = self._ratfun.poles(damping=damping, numeric=numeric)
 
         polesdict = {}
         for pole in poles:
@@ -1595,7 +1607,7 @@ class Expr(ExprPrint, ExprMisc):
             return self.copy()
         return self.__class__(self._ratfun.general(), **self.assumptions)
 
-    def partfrac(self, combine_conjugates=False, damping=None):
+    def partfrac(self, combine_conjugates=False, damping=None, numeric=False):
         """Convert rational function into partial fraction form.   For example,
 
         5 + (5 - 15 * j / 4) / (s + 2 * j) + (5 + 15 * j / 4) / (s - 2 * j)
@@ -1603,16 +1615,21 @@ class Expr(ExprPrint, ExprMisc):
         If combine_conjugates is True then the pair of partial
         fractions for complex conjugate poles are combined.
 
+        If numeric is True, the poles and residues are found
+        numerically.
+
         See also canonical, standard, general, timeconst, and ZPK."""
 
         try:
             if self._ratfun is None:
                 return self.copy()        
             return self.__class__(self._ratfun.partfrac(combine_conjugates,
-                                                        damping),
+                                                        damping,
+                                                        numeric=numeric),
                                   **self.assumptions)
         except ValueError:
-            return self.as_sum().partfrac(combine_conjugates, damping)
+            return self.as_sum().partfrac(combine_conjugates, damping,
+                                          numeric)
 
     def recippartfrac(self, combine_conjugates=False, damping=None):
         """Convert rational function into partial fraction form
@@ -1680,7 +1697,7 @@ class Expr(ExprPrint, ExprMisc):
             result += self.__class__(term).timeconst()
         return self.__class__(result, **self.assumptions)            
 
-    def ZPK(self):
+    def ZPK(self, numeric=False):
         """Convert to zero-pole-gain (ZPK) form (factored form).  For example,
 
         5 * (s + 1)**2 / ((s - 2 * j) * (s + 2 * j))
@@ -1688,15 +1705,17 @@ class Expr(ExprPrint, ExprMisc):
         Note, both the numerator and denominator are expressed as
         products of monic factors, i.e., (s + 1 / 3) rather than (3 * s + 1).
 
+        If numeric is True, the poles and zeros are found numerically.
+
         See also canonical, general, standard, partfrac, and timeconst.
 
         """
 
         if self._ratfun is None:
             return self.copy()        
-        return self.__class__(self._ratfun.ZPK(), **self.assumptions)
+        return self.__class__(self._ratfun.ZPK(numeric), **self.assumptions)
 
-    def factored(self):
+    def factored(self, numeric=False):
         """Convert to factored form.  For example,
 
         5 * (s + 1)**2 / ((s - 2 * j) * (s + 2 * j))
@@ -1708,7 +1727,7 @@ class Expr(ExprPrint, ExprMisc):
         
         if self._ratfun is None:
             return self.copy()
-        return self.__class__(self._ratfun.ZPK(), **self.assumptions)
+        return self.__class__(self._ratfun.ZPK(numeric), **self.assumptions)
     
     def expandcanonical(self):
         """Expand in terms for different powers with each term
@@ -11,6 +11,8 @@ from .symbols import j, omega, jomega, s
 
 class ImmittanceMixin(object):
 
+    __slots__ = ()
+
     @property
     def R(self):
         """Resistance."""
@@ -71,10 +71,17 @@ class DiscreteFourierDomainExpression(SequenceExpression):
         from .plot import plot_frequency
         return plot_frequency(self, kvector, **kwargs)
 
-    def IDFT(self, N=None, evaluate=True):
+    def IDFT(self, N=None, evaluate=True, numeric=False):
+        """Compute inverse discrete Fourier transform.  If `numeric` is
+        True, the expression is evaluated for k = 0, ..., N - 1 and the
+        inverse DFT is computed with numpy.fft; the result is a
+        sequence."""
 
         from .nexpr import n
 
+        if numeric:
+            return self._numeric_dft(N, n, inverse=True)
+
         if N is None:
             from .sym import sympify
             
@@ -310,13 +310,16 @@ def inverse_laplace_damped_sin(expr, s, t, **assumptions):
     return K * kCd * sym.DiracDelta(t), G
 
 
-def inverse_laplace_ratfun(expr, s, t, **assumptions):
+def inverse_laplace_ratfun(expr, s, t, poles=None, **assumptions):
+    """If poles is specified, this is a list of the poles of the
+    denominator of expr; this avoids finding the roots of the
+    denominator when it is shared by several expressions."""
 
     sexpr = Ratfun(expr, s)
 
     damping = assumptions.get('damping', None)
 
-    if assumptions.get('damped_sin', False):
+    if poles is None and assumptions.get('damped_sin', False):
         if sexpr.degree == 2:
             return inverse_laplace_damped_sin(sexpr, s, t, **assumptions)
         #if False and sexpr.degree == 3 and Ratfun(expr * s).degree == 2:
@@ -338,7 +341,8 @@ def inverse_laplace_ratfun(expr, s, t, **assumptions):
             return factor
 
     sexpr = Ratfun(expr, s)
-    poles = sexpr.poles(damping=damping)
+    if poles is None:
+        poles = sexpr.poles(damping=damping)
     polesdict = {}
     for pole in poles:
         polesdict[pole.expr] = pole.n
@@ -577,6 +581,17 @@ def inverse_laplace_term(expr, s, t, **assumptions):
     return cresult, uresult
 
 
+def inverse_laplace_poles(expr, s, t, poles, **assumptions):
+    """Calculate inverse Laplace transform of rational function expr
+    given the list of poles of its denominator."""
+
+    cresult, uresult = inverse_laplace_ratfun(expr, s, t, poles=poles,
+                                              **assumptions)
+    if assumptions.get('causal', False):
+        uresult = uresult * sym.Heaviside(t)
+    return inverse_laplace_make(t, sym.S.One, cresult, uresult, **assumptions)
+
+
 def inverse_laplace_make(t, const, cresult, uresult, **assumptions):
 
     result = const * (cresult + uresult)
@@ -163,6 +163,9 @@ def matrix_inverse(M, method='default'):
     if method == 'default':
         method = matrix_inverse_method
 
+    if method == 'auto':
+        return _matrix_inverse_auto(M)
+
     if method == 'GE':
         try:
             from sympy.matrices import dotprodsimp 
@@ -172,6 +175,8 @@ def matrix_inverse(M, method='default'):
             # with a poor pivot.
             with dotprodsimp(False):
                 return M.inv(method='GE')
+        except MatrixInverseTimeout:
+            raise
         except:
             return M.inv(method='GE')            
 
@@ -185,10 +190,246 @@ def matrix_inverse(M, method='default'):
             from sympy.polys.domainmatrix import DomainMatrix
             dM = DomainMatrix.from_list_sympy(*M.shape, rows=M.tolist())        
             return dM.inv(method=method[3:]).to_Matrix()            
+        except MatrixInverseTimeout:
+            raise
         except:
             method = matrix_inverse_fallback_method
 
     return M.inv(method=method)
 
+
+# Timing profile of the matrix inversion methods used by the 'auto'
+# method.  This is keyed by (method, matrix size); each entry is a
+# dictionary with the number of calls that completed, their total time
+# in seconds, and the number of calls that timed out.
+matrix_inverse_profile = {}
+
+
+class MatrixInverseTimeout(Exception):
+    pass
+
+
+def _profile_rank(method, N):
+    """Rank method for matrices of size N using matrix_inverse_profile.
+    Methods that have completed are ranked by their average time,
+    followed by the untried methods, and then the methods that have
+    only timed out."""
+
+    entry = matrix_inverse_profile.get((method, N))
+    if entry is None:
+        return (1, 0)
+    if entry['calls'] == 0:
+        return (2, 0)
+    return (0, entry['time'] / entry['calls'])
+
+
+def matrix_inverse_methods(M):
+    """Return list of matrix inversion methods to try for M in order of
+    preference.  This depends on the matrix size, sparsity, number of
+    symbols, and whether the elements are numeric.  The methods are
+    then reordered using the times recorded in matrix_inverse_profile
+    for previous matrices of the same size."""
+
+    N = M.shape[0]
+    if N == 0:
+        return ['LU']
+
+    methods = _matrix_inverse_methods(M)
+    # The sort is stable so untried methods keep their order.
+    return sorted(methods, key=lambda method: _profile_rank(method, N))
+
+
+def _matrix_inverse_methods(M):
+
+    N = M.shape[0]
+
+    nonzero = len([elt for elt in M if elt != 0])
+    density = nonzero / (N * N)
+    symbols = M.free_symbols
+
+    if symbols == set():
+        # GE only hangs with symbolic pivots.
+        return ['GE', 'LU', 'ADJ']
+    if N <= 10:
+        # The domain matrix methods are much faster for small
+        # matrices if they are available.
+        return ['DM-charpoly', 'ADJ', 'LU']
+    if len(symbols) > N or density > 0.5:
+        return ['ADJ', 'LU', 'GE']
+    return ['LU', 'ADJ', 'GE']
+
+
+def _matrix_inverse_timed(M, method, timeout=None):
+    """Invert M using the specified method, raising MatrixInverseTimeout
+    if this takes longer than timeout seconds.  The timeout requires
+    SIGALRM and so is ignored on Windows and in threads other than the
+    main thread."""
+
+    import signal
+    import threading
+    from time import perf_counter
+
+    alarm = (timeout is not None and hasattr(signal, 'setitimer') and
+             threading.current_thread() is threading.main_thread())
+
+    if alarm:
+        def handler(signum, frame):
+            raise MatrixInverseTimeout('%s took longer than %s s' %
+                                       (method, timeout))
+
+        oldhandler = signal.signal(signal.SIGALRM, handler)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    key = (method, M.shape[0])
+    if key not in matrix_inverse_profile:
+        matrix_inverse_profile[key] = {'calls': 0, 'time': 0.0,
+                                       'timeouts': 0}
+    profile = matrix_inverse_profile[key]
+
+    start = perf_counter()
+    try:
+        Minv = matrix_inverse(M, method=method)
+    except MatrixInverseTimeout:
+        profile['timeouts'] += 1
+        raise
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, oldhandler)
+
+    profile['calls'] += 1
+    profile['time'] += perf_counter() - start
+    return Minv
+
+
+def _matrix_inverse_auto(M):
+    """Invert M trying each of the methods chosen by
+    `matrix_inverse_methods` in turn.  If a method takes longer than
+    config.matrix_inverse_timeout, the next method is tried.  The
+    last method is not timed out."""
+
+    from .config import matrix_inverse_timeout
+
+    methods = matrix_inverse_methods(M)
+    for method in methods[:-1]:
+        try:
+            return _matrix_inverse_timed(M, method, matrix_inverse_timeout)
+        except MatrixInverseTimeout:
+            pass
+
+    return _matrix_inverse_timed(M, methods[-1])
+
+
+def _ring_rows(rows, K):
+    """Clear the denominators of each row of elements from the field K so
+    that the elements are in the associated polynomial ring.  Scaling
+    a row of the augmented matrix does not change the solution."""
+
+    R = K.get_ring()
+
+    newrows = []
+    for row in rows:
+        lcm = R.one
+        for a in row:
+            lcm = R.lcm(lcm, R.convert(K.denom(a)))
+        newrows.append([R.exquo(lcm, R.convert(K.denom(a))) *
+                        R.convert(K.numer(a)) for a in row])
+    return newrows, R
+
+
+def _bareiss_solve(M, b):
+    """Solve M x = b using fraction-free Bareiss elimination over the
+    polynomial ring (or fraction field) holding the elements of M and b.
+    The elements are only converted back to SymPy expressions at the
+    end.  The result is a list of numerator/denominator ratios with the
+    common factors removed."""
+
+    from sympy.polys.constructor import construct_domain
+
+    N = M.shape[0]
+    cols = M.shape[1] + b.shape[1]
+    rows = [Mrow + brow for Mrow, brow in zip(M.tolist(), b.tolist())]
+
+    # Convert floats to rationals, otherwise the domain is RR and the
+    # solution is approximate.
+    elts = [sym.nsimplify(elt, rational=True) if elt.has(sym.Float)
+            else elt for row in rows for elt in row]
+
+    K, elts = construct_domain(elts)
+    if K.is_RR or K.is_CC:
+        raise NotImplementedError('Cannot solve exactly over %s' % K)
+
+    rows = [elts[r * cols:(r + 1) * cols] for r in range(N)]
+    if K.is_Field and K.has_assoc_Ring:
+        rows, K = _ring_rows(rows, K)
+
+    # Forward elimination; all the divisions are exact.
+    prev = K.one
+    for k in range(N):
+        if not rows[k][k]:
+            for i in range(k + 1, N):
+                if rows[i][k]:
+                    rows[k], rows[i] = rows[i], rows[k]
+                    break
+            else:
+                raise ValueError('Matrix det == 0; not invertible.')
+
+        akk = rows[k][k]
+        for i in range(k + 1, N):
+            aik = rows[i][k]
+            row = rows[i]
+            for j in range(k + 1, cols):
+                row[j] = K.exquo(akk * row[j] - aik * rows[k][j], prev)
+            row[k] = K.zero
+        prev = akk
+
+    # Fraction-free back substitution.  The last pivot is the
+    # determinant (apart from its sign) and x = y / det.
+    det = prev
+    results = []
+    for c in range(N, cols):
+        y = [None] * N
+        for i in reversed(range(N)):
+            acc = det * rows[i][c]
+            for j in range(i + 1, N):
+                acc -= rows[i][j] * y[j]
+            y[i] = K.exquo(acc, rows[i][i])
+
+        for i in range(N):
+            if K.is_Field:
+                results.append(K.to_sympy(K.quo(y[i], det)))
+                continue
+            g, numer, denom = K.cofactors(y[i], det)
+            if K.is_negative(denom):
+                numer, denom = -numer, -denom
+            results.append(K.to_sympy(numer) / K.to_sympy(denom))
+
+    return sym.Matrix(cols - N, N, results).T
+
+
+def matrix_solve(M, b, method='default'):
+    """Solve M x = b for x.  The method can be 'DM-bareiss' for
+    fraction-free elimination over a polynomial ring or one of the
+    matrix inversion methods, including 'auto'.  Note, the default
+    matrix inversion method (config.matrix_inverse_method) is only
+    used if the method is 'default' and config.matrix_solve_method is
+    not 'DM-bareiss'."""
+
+    from .config import matrix_solve_method
+
+    if method == 'default':
+        method = matrix_solve_method
+
+    if method == 'DM-bareiss':
+        from sympy.polys.polyerrors import CoercionFailed, DomainError
+
+        try:
+            return _bareiss_solve(M, b)
+        except (NotImplementedError, CoercionFailed, DomainError):
+            # The elements cannot be represented in a suitable domain.
+            method = 'default'
+
+    return matrix_inverse(M, method=method) * b
+
     
 from .expr import Expr, expr
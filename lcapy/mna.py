@@ -7,12 +7,17 @@ Copyright 2014--2019 Michael Hayes, UCECE
 from __future__ import division
 from .phasor import PhasorCurrent, PhasorVoltage
 from .vector import Vector
-from .matrix import Matrix, matrix_inverse
+from .matrix import Matrix, matrix_solve
 from .sym import symsimplify
 from .expr import ExprDict, expr
 from .voltage import Vtype
 from .current import Itype
 from .systemequations import SystemEquations
+from .super import Superposition
+from .sym import tsym
+from types import SimpleNamespace
+from math import gcd
+from functools import lru_cache
 import sympy as sym
 
 # Note, all the maths is performed using sympy expressions and the
@@ -20,7 +25,74 @@ import sympy as sym
 # efficient and, more importantly, overcomes some of the wrapping
 # problems which casues the is_real attribute to be dropped.
 
-class Nodedict(ExprDict):
+class MNAdict(ExprDict):
+
+    def time(self, **assumptions):
+        """Convert each element to the time domain.  The s-domain
+        responses of a circuit usually share the same denominator (the
+        determinant of the MNA matrix).  The responses are grouped by
+        denominator so that its poles are found once and then used for
+        the residues of each numerator."""
+
+        # Poles keyed by monic denominator polynomial.
+        polesdict = {}
+
+        new = self.__class__()
+        for k, v in self.items():
+            if not isinstance(v, Superposition):
+                new[k] = v.time(**assumptions)
+                continue
+
+            result = v.time_class(0)
+            for kind, val in v.items():
+                if kind == 's':
+                    result += self._transient_time(val, polesdict,
+                                                   **assumptions)
+                elif hasattr(val, 'time'):
+                    result += val.time(**assumptions)
+                else:
+                    result += val
+            new[k] = result
+        return new
+
+    def _transient_time(self, V, polesdict, **assumptions):
+        """Convert s-domain expression V to the time domain using the
+        poles in polesdict for its denominator, if known."""
+
+        from .ratfun import Ratfun
+        from .laplace import inverse_laplace_poles
+
+        var = V.var
+        try:
+            Q, M, D, delay, undef = Ratfun(V.expr, var).as_QMD()
+            Dpoly = sym.Poly(D, var)
+            key = Dpoly.monic()
+        except (ValueError, sym.PolynomialError,
+                sym.polys.polyerrors.DomainError):
+            return V.time(**assumptions)
+
+        if delay != 0 or undef != 1 or Dpoly.degree() < 1:
+            return V.time(**assumptions)
+
+        assumptions = V.merge_assumptions(**assumptions)
+        if key not in polesdict:
+            poles = Ratfun(1 / D, var).poles(
+                damping=assumptions.get('damping', None))
+            if sum([pole.n for pole in poles]) != Dpoly.degree():
+                # Have not found all the roots.
+                poles = None
+            polesdict[key] = poles
+
+        poles = polesdict[key]
+        if poles is None:
+            return V.time(**assumptions)
+
+        result = inverse_laplace_poles(V.expr, var, tsym, poles,
+                                       **assumptions)
+        return V._laplace_conjugate_class(result)
+
+
+class Nodedict(MNAdict):
 
     def __getitem__(self, name):
         """Return node by name or number."""
@@ -31,10 +103,31 @@ class Nodedict(ExprDict):
         return super(Nodedict, self).__getitem__(name)
 
 
-class Branchdict(ExprDict):
+class Branchdict(MNAdict):
     pass
     
 
+def _common_denominator(vals):
+    """Return lowest common denominator of the rational numbers vals."""
+
+    d = 1
+    for val in vals:
+        d = d * val.q // gcd(d, val.q)
+    return d
+
+
+@lru_cache(maxsize=128)
+def _schur_reduce(AII, AIP, API, ZI):
+    """Return W = A_II^-1 A_IP, w = A_II^-1 Z_I, A_PI W, and A_PI w.  The
+    arguments are immutable matrices so the reductions are cached by
+    their contents.  Thus identical blocks, say for repeated
+    subcircuits, are reused across netlists and analyses."""
+
+    X = matrix_solve(AII, AIP.row_join(ZI))
+    W, w = X[:, 0:AIP.shape[1]], X[:, AIP.shape[1]:]
+    return W, w, API * W, API * w
+
+
 class MNAMixin(object):
     """This class performs modified nodal analysis (MNA) on a netlist of
     components.  There are several variants:
@@ -62,7 +155,8 @@ class MNAMixin(object):
     """
 
     def _invalidate(self):
-        for attr in ('_A', '_Vdict', '_Idict'):
+        for attr in ('_A', '_Ainv', '_Vdict', '_Idict', '_dpsub',
+                     '_dpcolumns'):
             if hasattr(self, attr):
                 delattr(self, attr)
 
@@ -96,14 +190,19 @@ class MNAMixin(object):
         if hasattr(self, '_s_model'):
             raise RuntimeError('Cannot analyse s-domain model')
             
-        # Determine which branch currents are needed.
+        # Determine which branch currents are needed.  The
+        # components for the branch currents are remembered since
+        # a component may need an extra branch current.
         self.unknown_branch_currents = []
+        self._branch_cpts = []
 
         for elt in self.elements.values():
             if elt.need_branch_current:
                 self.unknown_branch_currents.append(elt.name)
+                self._branch_cpts.append(elt)
             if elt.need_extra_branch_current:
                 self.unknown_branch_currents.append(elt.name + 'X')
+                self._branch_cpts.append(elt)
 
         # Generate stamps.
         num_nodes = len(self.node_list) - 1
@@ -129,7 +228,9 @@ class MNAMixin(object):
 
     def _solve(self):
         """Solve network."""
-        
+
+        from .config import namespace_reduction
+
         if hasattr(self, '_Vdict'):
             return
         self._analyse()
@@ -142,8 +243,19 @@ class MNAMixin(object):
             # The default method, Gaussian elimination, is the fastest
             # but hangs on some matrices with sympy-1.6.1
             # Comparative times for the testsuites are:
-            # GE 66, ADJ 73, LU 76. 
-            Ainv = matrix_inverse(self._A)
+            # GE 66, ADJ 73, LU 76.  The default is now fraction-free
+            # elimination over a polynomial ring, see matrix_solve.
+            results = None
+            if hasattr(self, '_Ainv'):
+                # Have inverse updated by _update.
+                results = self._inverse_solve()
+            elif namespace_reduction:
+                try:
+                    results = self._solve_reduced()
+                except ValueError:
+                    pass
+            if results is None:
+                results = matrix_solve(self._A, self._Z)
         except ValueError:
             comment = ''
             if self.kind == 'dc':
@@ -157,7 +269,7 @@ class MNAMixin(object):
 5. part of the circuit is not referenced to ground
 %s""" % (self.kind, comment))
 
-        results = symsimplify(Ainv * self._Z)
+        results = symsimplify(results)
 
         results = results.subs(self.context.symbols)
 
@@ -212,6 +324,286 @@ class MNAMixin(object):
             elif elt.type in ('I', ):
                 self._Idict[elt.name] = elt.Isc
 
+    def _namespace_blocks(self):
+        """Return dictionary, keyed by namespace, of lists of the indexes
+        of the unknowns that are only connected to components in
+        that namespace."""
+
+        blocks = {}
+        enodes = self.equipotential_nodes
+        for m, node in enumerate(self.node_list[1:]):
+            namespaces = set()
+            for node1 in enodes[node]:
+                for elt in self.nodes[node1]._connected:
+                    # Wires are not stamped; they just join nodes.
+                    if elt.type == 'W' or self._elements.get(elt.name) is not elt:
+                        continue
+                    namespaces.add(elt.namespace)
+            if len(namespaces) == 1:
+                namespace = namespaces.pop()
+                if namespace != '':
+                    blocks.setdefault(namespace, []).append(m)
+
+        num_nodes = len(self.node_list) - 1
+        for m, elt in enumerate(self._branch_cpts):
+            namespace = elt.namespace
+            if namespace != '':
+                blocks.setdefault(namespace, []).append(m + num_nodes)
+        return blocks
+
+    def _solve_reduced(self):
+        """Solve the MNA equations by first eliminating the unknowns
+        internal to each namespace using a Schur complement.  Each
+        namespace block is reduced to a port-level system,
+
+        A_PP - A_PI A_II^-1 A_IP,
+
+        and the internal unknowns are found by back-substitution.
+        Identical blocks, say for repeated subcircuits, are only
+        reduced once since the reductions are cached by the contents
+        of the block matrices, see _schur_reduce.  None is returned if
+        there are no blocks to reduce."""
+
+        blocks = self._namespace_blocks()
+
+        A, Z = self._A, self._Z
+        entries = A.todok()
+
+        owner = {}
+        for namespace, indexes in blocks.items():
+            for index in indexes:
+                owner[index] = namespace
+
+        # The internal unknowns of one block must not be coupled to
+        # those of another block, say by a controlled source.
+        for i, j in entries:
+            ni, nj = owner.get(i), owner.get(j)
+            if ni is not None and nj is not None and ni != nj:
+                blocks.pop(ni, None)
+                blocks.pop(nj, None)
+        if blocks == {}:
+            return None
+
+        owner = {}
+        ports = {}
+        for namespace, indexes in blocks.items():
+            ports[namespace] = set()
+            for index in indexes:
+                owner[index] = namespace
+
+        for i, j in entries:
+            if i in owner and j not in owner:
+                ports[owner[i]].add(j)
+            elif j in owner and i not in owner:
+                ports[owner[j]].add(i)
+
+        N = A.shape[0]
+        outer = [m for m in range(N) if m not in owner]
+        outer_index = dict((m, k) for k, m in enumerate(outer))
+
+        Ar = A.extract(outer, outer)
+        Zr = Z.extract(outer, [0])
+
+        reductions = []
+        for namespace, I in blocks.items():
+            P = sorted(ports[namespace])
+            W, w, S, u = self._reduce_block(I, P)
+
+            Pr = [outer_index[p] for p in P]
+            for a, p in enumerate(Pr):
+                Zr[p] -= u[a]
+                for b, q in enumerate(Pr):
+                    Ar[p, q] -= S[a, b]
+            reductions.append((I, P, W, w))
+
+        xr = matrix_solve(Ar, Zr)
+
+        results = sym.zeros(N, 1)
+        for k, m in enumerate(outer):
+            results[m] = xr[k]
+
+        for I, P, W, w in reductions:
+            xI = w - W * sym.Matrix([results[p] for p in P])
+            for k, m in enumerate(I):
+                results[m] = xI[k]
+        return results
+
+    def _reduce_block(self, I, P):
+        """Return W = A_II^-1 A_IP, w = A_II^-1 Z_I, A_PI W, and A_PI w
+        for the block of internal unknowns I and port unknowns P."""
+
+        AII = sym.ImmutableMatrix(self._A.extract(I, I))
+        AIP = sym.ImmutableMatrix(self._A.extract(I, P))
+        API = sym.ImmutableMatrix(self._A.extract(P, I))
+        ZI = sym.ImmutableMatrix(self._Z.extract(I, [0]))
+
+        return _schur_reduce(AII, AIP, API, ZI)
+
+    def _cpt_stamps(self, cpt):
+        """Return the stamps of the component cpt in isolation, i.e.,
+        its contributions to the MNA matrices."""
+
+        num_nodes = self._G.shape[0]
+        num_branches = self._D.shape[0]
+        stamps = SimpleNamespace(kind=self.kind,
+                                 elements=self.elements,
+                                 _branch_index=self._branch_index,
+                                 _G=sym.zeros(num_nodes, num_nodes),
+                                 _B=sym.zeros(num_nodes, num_branches),
+                                 _C=sym.zeros(num_branches, num_nodes),
+                                 _D=sym.zeros(num_branches, num_branches),
+                                 _Is=sym.zeros(num_nodes, 1),
+                                 _Es=sym.zeros(num_branches, 1))
+        cpt._stamp(stamps)
+        return stamps
+
+    def _cpt_current(self, name):
+        """Return the tuple (a, z) for the current through the component
+        name, where the current is a x - z and x is the vector of
+        unknowns.  The current is found from the contribution of the
+        component to the KCL equation at one of its nodes.  It is
+        defined to be into the positive node for passive devices and
+        out of the positive node for sources."""
+
+        self._analyse()
+        cpt = self.elements[name]
+        stamps = self._cpt_stamps(cpt)
+
+        sign = -1 if cpt.is_source else 1
+        n = self._node_index(cpt.nodenames[0])
+        if n < 0:
+            # The current out of the negative node is opposite.
+            n = self._node_index(cpt.nodenames[1])
+            sign = -sign
+        if n < 0:
+            raise ValueError('Cannot determine current through %s' % name)
+
+        a = stamps._G[n, :].row_join(stamps._B[n, :])
+        return sign * a, sign * stamps._Is[n]
+
+    def _inverse_update(self, dG):
+        """Update the inverse of the numeric A matrix for the change dG of
+        the G matrix using the Woodbury identity.  The inverse is found
+        on the first update and is stored as a matrix of integers and
+        a common denominator so that each update only requires O(N^2)
+        integer operations.  The inverse is discarded if the elements
+        are not rational or the updated matrix is singular."""
+
+        if not hasattr(self, '_Ainv'):
+            try:
+                Ainv = matrix_solve(self._A, sym.eye(self._A.shape[0]))
+            except ValueError:
+                return
+            if not all(elt.is_Rational for elt in Ainv):
+                return
+            d = _common_denominator(Ainv)
+            self._Ainv = ([[int(elt * d) for elt in row]
+                           for row in Ainv.tolist()], d)
+
+        idx = sorted(set(m for m, n in dG.todok()))
+        if idx == []:
+            return
+
+        # With dA = U C U^T where U selects the rows idx,
+        # inv(A + dA) = Ainv - Ainv U W U^T Ainv,
+        # where W = C inv(I + U^T Ainv U C).
+        Nm, d = self._Ainv
+        k = len(idx)
+        C = dG.extract(idx, idx)
+        K = sym.eye(k) + sym.Matrix(k, k, lambda a, b:
+                                    sym.Rational(Nm[idx[a]][idx[b]], d)) * C
+        if K.det() == 0:
+            del self._Ainv
+            return
+        W = C * K.inv()
+        if not all(elt.is_Rational for elt in W):
+            del self._Ainv
+            return
+        w = _common_denominator(W)
+        Wn = [[int(W[a, b] * w) for b in range(k)] for a in range(k)]
+
+        # With Ainv = Nm / d and W = Wn / w, the updated inverse is
+        # (d w Nm - Nm U Wn U^T Nm) / (d^2 w).
+        R = [[sum(Wn[a][b] * Nm[idx[b]][n] for b in range(k))
+              for n in range(len(Nm))] for a in range(k)]
+        dw = d * w
+        newNm = []
+        for row in Nm:
+            P = [row[m] for m in idx]
+            row = [elt * dw for elt in row]
+            for p, Ra in zip(P, R):
+                if p:
+                    row = [elt - p * r for elt, r in zip(row, Ra)]
+            newNm.append(row)
+
+        # Remove the common factors.
+        g = d * dw
+        for row in newNm:
+            for elt in row:
+                g = gcd(g, elt)
+                if g == 1:
+                    break
+            if g == 1:
+                break
+        if g != 1:
+            newNm = [[elt // g for elt in row] for row in newNm]
+        self._Ainv = newNm, d * dw // g
+
+    def _inverse_solve(self):
+        """Return the solution of the MNA equations using the inverse
+        of the A matrix updated by _inverse_update."""
+
+        Nm, d = self._Ainv
+        if not all(elt.is_Rational for elt in self._Z):
+            # Have symbolic sources.
+            Ainv = sym.Matrix([[sym.Rational(elt, d) for elt in row]
+                               for row in Nm])
+            return Ainv * self._Z
+
+        z = _common_denominator(self._Z)
+        Zn = [int(elt * z) for elt in self._Z]
+        return sym.Matrix([sym.Rational(sum(a * b for a, b in zip(row, Zn)),
+                                        d * z) for row in Nm])
+
+    def _update(self, cpt, sign):
+        """Update the MNA system for the addition (sign = 1) or removal
+        (sign = -1) of the admittance component cpt without stamping
+        the other components.  The nodes of cpt must already be in the
+        netlist.  For numeric systems, the inverse of the A matrix is
+        updated with a low-rank update.  Symbolic systems are solved
+        again when required since a low-rank update of the symbolic
+        inverse is slower than the fraction-free solution."""
+
+        if sign > 0:
+            self._cpt_clone(cpt)
+            cpt = self._elements[cpt.name]
+        else:
+            cpt = self._cpt_remove(cpt.name)
+
+        for attr in ('_Vdict', '_Idict', '_dpsub', '_dpcolumns'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+        if not hasattr(self, '_A'):
+            return
+
+        # Stamp the component into empty matrices to find the change.
+        stamps = self._cpt_stamps(cpt)
+
+        dG = sign * stamps._G
+        if self._A.free_symbols == set() and dG.free_symbols == set():
+            self._inverse_update(dG)
+        elif hasattr(self, '_Ainv'):
+            del self._Ainv
+
+        # Only change the non-zero elements.
+        for (m, n), val in dG.todok().items():
+            self._G[m, n] += val
+            self._A[m, n] += val
+        for (m, n), val in stamps._Is.todok().items():
+            self._Is[m] += sign * val
+            self._Z[m] += sign * val
+
     @property
     def A(self):
         """Return A matrix for MNA"""
@@ -17,8 +17,11 @@ from .grammar import delimiters
 from .immittancemixin import ImmittanceMixin
 from .current import Current
 from .opts import Opts
+from .state import state
+from copy import copy
 import lcapy
 import inspect
+import re
 import sys
 import sympy as sym
 
@@ -30,6 +33,27 @@ cptaliases = {'E': 'VCVS', 'F': 'CCCS',
               'k': 'Spring'}
 
 
+network_classes = {}
+
+def network_class(classname):
+    """Return the oneport or twoport class for the component class
+    name or None if there is not one."""
+
+    try:
+        return network_classes[classname]
+    except KeyError:
+        pass
+
+    # Handle aliases.
+    name = cptaliases.get(classname, classname)
+
+    newclass = getattr(lcapy.oneport, name, None)
+    if newclass is None:
+        newclass = getattr(lcapy.twoport, name, None)
+    network_classes[classname] = newclass
+    return newclass
+
+
 class Cpt(ImmittanceMixin):
 
     dependent_source = False
@@ -42,7 +66,13 @@ class Cpt(ImmittanceMixin):
     flip_branch_current = False
     ignore = False
     equipotential_nodes = ()
-    
+
+    # Large netlists can have many components so attributes are
+    # stored in slots rather than a dict.  The attributes that can be
+    # derived from the name and opts_string are found when required.
+    __slots__ = ('cct', 'type', 'id', 'defname', 'name', 'nodenames',
+                 '_string', 'opts_string', 'args', 'explicit_args',
+                 'keyword', '_opts', '_cpt', '_context')
 
     def __init__(self, cct, namespace, defname, name, cpt_type, cpt_id, string,
                  opts_string, nodes, keyword, *args):
@@ -52,20 +82,7 @@ class Cpt(ImmittanceMixin):
         self.id = cpt_id
         self.defname = defname
         self.name = name
-        self.relname = name
-        self.namespace = ''
         self.nodenames = nodes
-        self.relnodes = nodes
-        
-        parts = name.split('.')
-        if len(parts) > 1:
-            self.namespace = '.'.join(parts[0:-1]) + '.'
-            self.relname = parts[-1]
-            self.relnodes = []
-            for node in nodes:
-                if node.startswith(self.namespace):
-                    node = node[len(self.namespace):]
-                self.relnodes.append(node)
 
         self._string = string
         #self.net = string.split(';')[0]
@@ -74,13 +91,14 @@ class Cpt(ImmittanceMixin):
         self.opts_string = opts_string
         self.args = args
         self.explicit_args = args        
-        self.classname = self.__class__.__name__
         self.keyword = keyword
-        self.opts = Opts(self.opts_string)
+        self._opts = None
+
+        self._cpt = None
+        self._context = state.context
 
         # No defined cpt
         if self.type in ('XX', 'Cable'):
-            self.cpt = lcapy.oneport.Dummy()
             return
 
         if ((args == () and not self.type in ('W', 'O', 'P'))
@@ -95,22 +113,80 @@ class Cpt(ImmittanceMixin):
             args += (value, )
             self.args = args
 
-        classname = self.classname
-        # Handle aliases.
-        try:
-            classname = cptaliases[classname]
-        except:
-            pass
-                
+    @property
+    def cpt(self):
+        """Network object, such as a oneport, for the component.  This
+        is created when first required since this sympifies the
+        args and is not needed to parse a netlist.  It is shared
+        with clones of the component made after it is created."""
+
+        if self._cpt is not None:
+            return self._cpt
+
+        if self.type in ('XX', 'Cable'):
+            self._cpt = lcapy.oneport.Dummy()
+            return self._cpt
+
+        newclass = network_class(self.classname)
+        if newclass is None:
+            raise AttributeError('No network object for component %s' %
+                                 self.name)
+
+        # Create the symbols for the args in the context the
+        # component was parsed in.
+        state.switch_context(self._context)
         try:
-            newclass = getattr(lcapy.oneport, classname)
-        except:
-            try:
-                newclass = getattr(lcapy.twoport, classname)
-            except:
-                return
-                
-        self.cpt = newclass(*args)
+            self._cpt = newclass(*self.args)
+        finally:
+            state.restore_context()
+        return self._cpt
+
+    @property
+    def classname(self):
+        return self.__class__.__name__
+
+    @property
+    def namespace(self):
+        """Namespace prefix of the component name, e.g., 'a.b.'
+        for 'a.b.R1'."""
+
+        parts = self.name.split('.')
+        if len(parts) == 1:
+            return ''
+        return '.'.join(parts[0:-1]) + '.'
+
+    @property
+    def relname(self):
+        """Component name relative to its namespace."""
+
+        return self.name.split('.')[-1]
+
+    @property
+    def relnodes(self):
+        """Node names relative to the component namespace."""
+
+        namespace = self.namespace
+        if namespace == '':
+            return self.nodenames
+
+        relnodes = []
+        for node in self.nodenames:
+            if node.startswith(namespace):
+                node = node[len(namespace):]
+            relnodes.append(node)
+        return relnodes
+
+    @property
+    def opts(self):
+
+        if self._opts is None:
+            self._opts = Opts(self.opts_string)
+        return self._opts
+
+    @opts.setter
+    def opts(self, opts):
+
+        self._opts = opts
 
     def __repr__(self):
         return self.__str__()
@@ -126,6 +202,39 @@ class Cpt(ImmittanceMixin):
         """Make copy of net."""
         
         return str(self)
+
+    def _clone(self, cct):
+        """Make copy of component for netlist cct without reparsing its net.
+        The parsed args and the network object, if it has been created,
+        are shared since they are not modified but the opts are copied
+        since these can be.  The clone does not refer to this component
+        so that it does not keep this netlist alive.
+
+        If the current context differs from the context the component
+        was parsed in, the network object is created again so that,
+        as when the net is reparsed, the symbols for the args are
+        defined in the current context."""
+
+        new = copy(self)
+        new.cct = cct
+        new._context = state.context
+        if new._context is not self._context:
+            new._cpt = None
+        if self._opts is not None:
+            new.opts = Opts(self._opts)
+        return new
+
+    def _has_symbols(self, names):
+        """Return True if any of the args may refer to one of the symbol
+        names.  This is conservative since it only checks the
+        strings."""
+
+        for arg in self.args:
+            string = str(arg)
+            for name in names:
+                if re.search(r'\b%s\b' % re.escape(name), string):
+                    return True
+        return False
     
     def _arg_format(self, value):
         """Place value string inside curly braces if it contains a delimiter."""
@@ -629,6 +738,8 @@ class Cpt(ImmittanceMixin):
     
 class Invalid(Cpt):
     
+    __slots__ = ()
+
     @property
     def cpt(self):
          raise NotImplementedError('Invalid component for circuit analysis: %s' % self)       
@@ -636,30 +747,40 @@ class Invalid(Cpt):
 
 class NonLinear(Invalid):
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         raise NotImplementedError('Cannot analyse non-linear component: %s' % self)
 
 
 class TimeVarying(Invalid):
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         raise NotImplementedError('Cannot analyse time-varying component: %s' % self)
 
 
 class Logic(Invalid):
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         raise NotImplementedError('Cannot analyse logic component: %s' % self)
 
 
 class Misc(Invalid):
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         raise NotImplementedError('Cannot analyse misc component: %s' % self)
 
 
 class Ignored(Cpt):
 
+    __slots__ = ()
+
     ignore = True
 
     def _stamp(self, cct):
@@ -669,6 +790,8 @@ class Ignored(Cpt):
 
 class Dummy(Cpt):
 
+    __slots__ = ()
+
     causal = True
     dc = False
     ac = False
@@ -678,6 +801,8 @@ class Dummy(Cpt):
 
 
 class XX(Dummy):
+    __slots__ = ()
+
     directive = True
     ignore = True
     
@@ -698,6 +823,8 @@ class XX(Dummy):
     
 class IndependentSource(Cpt):
 
+    __slots__ = ()
+
     independent_source = True
     
     def _zero(self):
@@ -714,6 +841,8 @@ class IndependentSource(Cpt):
 
 class DependentSource(Dummy):
 
+    __slots__ = ()
+
     dependent_source = True        
 
     def _zero(self):
@@ -722,6 +851,8 @@ class DependentSource(Dummy):
     
 class RLC(Cpt):
 
+    __slots__ = ()
+
     def _s_model(self, var):
 
         if self.Voc == 0:
@@ -763,6 +894,8 @@ class RLC(Cpt):
 
 class RC(RLC):
 
+    __slots__ = ()
+
     def _noisy(self):
 
         dummy_node = self.dummy_node()
@@ -807,6 +940,8 @@ class RC(RLC):
 
 class C(RC):
 
+    __slots__ = ()
+
     reactive = True
 
     @property
@@ -867,6 +1002,8 @@ class C(RC):
 
 class CPE(RC):
 
+    __slots__ = ()
+
     # If n == 0, then not reactive
     reactive = True
 
@@ -876,6 +1013,8 @@ class CPE(RC):
 class VCVS(DependentSource):
     """VCVS"""
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -914,6 +1053,8 @@ class VCVS(DependentSource):
 class CCCS(DependentSource):
     """CCCS"""
 
+    __slots__ = ()
+
     need_control_current = True
     
     def _stamp(self, cct):
@@ -936,12 +1077,17 @@ class CCCS(DependentSource):
 
 class FB(Misc):
     """Ferrite bead"""
+
+    __slots__ = ()
+
     pass
 
 
 class VCCS(DependentSource):
     """VCCS"""
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         n1, n2, n3, n4 = self.node_indexes
         G = ConstantExpression(self.args[0]).expr
@@ -966,6 +1112,8 @@ class VCCS(DependentSource):
 class GY(Dummy):
     """Gyrator"""    
 
+    __slots__ = ()
+
     need_branch_current = True
     need_extra_branch_current = True
 
@@ -1009,6 +1157,8 @@ class GY(Dummy):
 class CCVS(DependentSource):
     """CCVS"""
 
+    __slots__ = ()
+
     need_branch_current = True
     need_control_current = True
 
@@ -1037,6 +1187,8 @@ class CCVS(DependentSource):
 
 class I(IndependentSource):
 
+    __slots__ = ()
+
     def _select(self, kind=None):
         """Select domain kind for component."""
         return self._netmake(args=self.cpt.Isc.netval(kind))
@@ -1060,7 +1212,7 @@ class I(IndependentSource):
             cct._Is[n2] -= I
 
     def _ss_model(self):
-        return self._netmake(args='%s(t)' % self.relname.lower)
+        return self._netmake(args='%s(t)' % self.relname.lower())
 
     def _s_model(self, var):
         return self._netmake(args=self.Isc.laplace()(var))
@@ -1071,6 +1223,8 @@ class I(IndependentSource):
 
 
 class K(Dummy):
+
+    __slots__ = ('Lname1', 'Lname2')
     
     def __init__(self, cct, namespace, defname, name, cpt_type, cpt_id, string,
                  opts_string, nodes, keyword, *args):
@@ -1113,6 +1267,8 @@ class K(Dummy):
 
 class L(RLC):
     
+    __slots__ = ()
+
     need_branch_current = True
     reactive = True
 
@@ -1200,6 +1356,8 @@ class L(RLC):
 class O(Dummy):
     """Open circuit"""
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         pass
 
@@ -1214,23 +1372,32 @@ class O(Dummy):
 
 class P(O):
     """Port"""
+
+    __slots__ = ()
+
     pass
 
 
 class R(RC):
 
+    __slots__ = ()
+
     def _r_model(self):    
         return self._copy()
 
 
 class RV(RC):
 
+    __slots__ = ()
+
     # TODO.  Can simulate as series resistors (1 - alpha) R and alpha R. 
     pass
 
 
 class SPpp(Dummy):
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1249,6 +1416,8 @@ class SPpp(Dummy):
 
 class SPpm(Dummy):
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1267,6 +1436,8 @@ class SPpm(Dummy):
             
 class SPppp(Dummy):
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1287,6 +1458,8 @@ class SPppp(Dummy):
             
 class SPpmm(Dummy):
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1307,6 +1480,8 @@ class SPpmm(Dummy):
 
 class SPppm(Dummy):
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1328,6 +1503,8 @@ class SPppm(Dummy):
 class TF(Cpt):
     """Transformer"""    
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1355,6 +1532,8 @@ class TF(Cpt):
 class TFtap(Cpt):
     """Tapped transformer"""    
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         raise NotImplementedError('Cannot analyse tapped transformer %s' % self)
 
@@ -1362,6 +1541,8 @@ class TFtap(Cpt):
 class TL(Ignored):
     """Transmission line"""
 
+    __slots__ = ()
+
     equipotential_nodes = (('out1', 'in1'),
                            ('out2', 'in2'))
     
@@ -1369,6 +1550,8 @@ class TL(Ignored):
 class Cable(Ignored):
     """Cable"""
 
+    __slots__ = ()
+
     equipotential_nodes = (('in+', 'out+'), ('in-', 'out-'), ('in', 'out'),
                            ('ignd', 'ognd', 'b', 't'), ('mid', 'out'))
 
@@ -1376,6 +1559,8 @@ class Cable(Ignored):
 class TP(Misc):
     """Two port"""
 
+    __slots__ = ()
+
     # TODO
     pass
 
@@ -1384,6 +1569,8 @@ class TR(Dummy):
     """Transfer function.  This is equivalent to a VCVS with the input and
     output referenced to node 0."""
 
+    __slots__ = ()
+
     need_branch_current = True
 
     def _stamp(self, cct):
@@ -1402,6 +1589,8 @@ class TR(Dummy):
 
 class V(IndependentSource):
 
+    __slots__ = ()
+
     need_branch_current = True
     flip_branch_current = True        
 
@@ -1445,6 +1634,8 @@ class V(IndependentSource):
 class W(Dummy):
     """Wire"""
 
+    __slots__ = ()
+
     def _stamp(self, cct):
         pass
 
@@ -1460,18 +1651,24 @@ class W(Dummy):
 class XT(Misc):
     """Crystal"""
 
+    __slots__ = ()
+
     reactive = True    
 
 
 class Y(RC):
     """Admittance"""
 
+    __slots__ = ()
+
     reactive = True
 
 
 class Z(RC):
     """Impedance"""
 
+    __slots__ = ()
+
     reactive = True    
 
 
@@ -1482,7 +1679,7 @@ def defcpt(name, base, docstring):
     if isinstance(base, str):
         base = classes[base]
 
-    newclass = type(name, (base, ), {'__doc__': docstring})
+    newclass = type(name, (base, ), {'__doc__': docstring, '__slots__': ()})
 
     classes[name] = newclass
 
@@ -89,8 +89,8 @@ class NetfileMixin(object):
         # Switch context to capture new symbol definitions
         if self.context is not None:
             state.switch_context(self.context)
-        self._add(string)
-        self._invalidate()
+        cpt = self._add(string)
+        self._changed(cpt, 1)
         if self.context is not None:        
             state.restore_context()
         return self
@@ -105,9 +105,7 @@ class NetfileMixin(object):
 
         string = string.strip()
         if '\n' in string:
-            lines = string.split('\n')
-            for line in lines:
-                self._add(line.strip(), namespace)
+            self._add_lines(string.split('\n'), namespace)
             return None
 
         cpt = self._parse(string, namespace)
@@ -115,12 +113,37 @@ class NetfileMixin(object):
             self._cpt_add(cpt)
         return cpt
 
+    def _add_lines(self, lines, namespace=''):
+        """Add the nets from a list of strings.  All the nets are parsed
+        before the components are added.  The symbols for the component
+        args are created together when the network objects for the
+        components are first required.  The caller is responsible for
+        switching context and invalidating."""
+
+        cpts = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith('.include '):
+                # The included nets follow the preceding nets.
+                self._cpts_add(cpts)
+                cpts = []
+            cpt = self._parse(line, namespace)
+            if cpt is not None:
+                cpts.append(cpt)
+        self._cpts_add(cpts)
+
+    def _cpts_add(self, cpts):
+
+        for cpt in cpts:
+            self._cpt_add(cpt)
+
     def netfile_add(self, filename):
         """Add the nets from file with specified filename"""
 
         self.dirname = dirname(filename)
         self._netfile_add(filename)
-    
+        self._invalidate()
+
     def _netfile_add(self, filename, namespace=''):
         """Add the nets from file with specified filename"""
 
@@ -151,7 +174,6 @@ class NetfileMixin(object):
 
         if self.context is not None:        
             state.switch_context(self.context)        
-        for line in lines:
-            self._add(line, namespace)
+        self._add_lines(lines, namespace)
         if self.context is not None:                    
             state.restore_context()
@@ -21,6 +21,7 @@ from .expr import Expr, expr
 from .subnetlist import SubNetlist
 from .mna import MNAMixin, Nodedict, Branchdict
 from .symbols import omega
+from .state import state
 from copy import copy
 
 
@@ -59,12 +60,57 @@ class Netlist(NetlistMixin, NetfileMixin):
     def _invalidate(self):
 
         for attr in ('_sch', '_sub', '_Vdict', '_Idict', '_analysis',
-                     '_node_map', '_ss', '_node_list', '_branch_list', '_G'):
+                     '_ss', '_dpsub', '_dpcolumns', '_enodes', '_cache',
+                     '_node_list', '_branch_list', '_G'):
             try:
                 delattr(self, attr)
             except:
                 pass
 
+    def _update(self, cpt, sign):
+        """Update the analysed subnetlists for the addition (sign = 1) or
+        removal (sign = -1) of component cpt.  This is only supported
+        for resistors and conductances between existing nodes since
+        these do not change the unknowns or the analysis.  False is
+        returned if a full analysis is required."""
+
+        if not hasattr(self, '_sub') or cpt.type not in ('R', 'G'):
+            return False
+
+        for node in cpt.nodenames:
+            connected = self.nodes[node]._connected
+            if sign > 0 and any(elt.name == cpt.name and elt is not cpt
+                                for elt in connected):
+                # Component has been overridden.
+                return False
+            # Check that the node is connected to other components,
+            # i.e., the node was not created by adding cpt and
+            # will not be orphaned by removing cpt.
+            if not any(elt is not cpt and elt.name in self._elements
+                       for elt in connected):
+                return False
+
+        for sub in self._sub.values():
+            sub._update(cpt, sign)
+        if hasattr(self, '_dpsub'):
+            self._dpsub._update(cpt, sign)
+            self._dpcolumns = {}
+
+        for attr in ('_sch', '_Vdict', '_Idict', '_analysis', '_ss'):
+            try:
+                delattr(self, attr)
+            except:
+                pass
+        return True
+
+    def _changed(self, cpt, sign):
+        """If the netlist has been analysed and cpt is a resistor or
+        conductance between existing nodes, the analysis is updated
+        rather than repeated."""
+
+        if cpt is None or not self._update(cpt, sign):
+            self._invalidate()
+
     def _groups(self):
 
         groups = self.independent_source_groups()        
@@ -22,14 +22,20 @@ from .voltage import Vname
 from .current import Iname
 from .simulator import Simulator
 from .netlistnamespace import NetlistNamespace
-from .matrix import Matrix
+from .matrix import Matrix, matrix_solve
+from .sym import symsimplify
 
 from . import mnacpts
 from collections import OrderedDict
+import sympy as sym
 
 
 class NetlistMixin(object):
 
+    # This is incremented whenever a component is added or removed.
+    # The topology derived from the components is cached against it.
+    _version = 0
+
     def __init__(self, filename=None, context=None, allow_anon=False):
 
         self._elements = OrderedDict()
@@ -90,7 +96,17 @@ class NetlistMixin(object):
     @property
     def symbols(self):
         """Return dictionary of symbols defined in the circuit."""
-        
+
+        # The symbols for the component args are defined when the
+        # network objects for the components are created.  Invalid
+        # components, such as diodes, do not have network objects.
+        for elt in self._elements.values():
+            if isinstance(elt, mnacpts.Invalid):
+                continue
+            try:
+                elt.cpt
+            except AttributeError:
+                pass
         return self.context.symbols
 
     @property
@@ -120,12 +136,28 @@ class NetlistMixin(object):
 
         if node not in self.nodes:
             self.nodes[node] = Node(self, node)
+            if '_enodes' in self.__dict__:
+                self._enodes.add((node, ))
         self.nodes[node].append(cpt)
 
+    def _cached(self, attr, func):
+        """Return the value of func() cached as attr until a component
+        is added or removed."""
+
+        cache = self.__dict__.setdefault('_cache', {})
+        if attr in cache:
+            version, value = cache[attr]
+            if version == self._version:
+                return value
+        value = func()
+        cache[attr] = (self._version, value)
+        return value
+
     def _cpt_add(self, cpt):
 
         if cpt.name in self._elements:
             print('Overriding component %s' % cpt.name)
+            self.__dict__.pop('_enodes', None)
             # Need to search lists and update component.
             # For example, remove nodes that are only connected
             # to this component.
@@ -133,16 +165,44 @@ class NetlistMixin(object):
             # Check that this name won't conflict with an attr.
             # For example, cannot have name V or I.  Perhaps
             # rename these attributes?
-            if hasattr(self, cpt.name):
+            if self._name_conflict(cpt.name):
                 raise ValueError('Invalid component name %s' % cpt.name)
 
         self._elements[cpt.name] = cpt
 
         for node in cpt.nodenames:
             self._node_add(node, cpt)
+        if '_enodes' in self.__dict__:
+            self._enodes.add_cpt(cpt)
+        self._version += 1
 
         self._namespace_add(cpt.namespace)
 
+    def _changed(self, cpt, sign):
+        """Called after component cpt is added (sign = 1) or before it
+        is removed (sign = -1).  cpt is None if several components
+        were added."""
+
+        self._invalidate()
+
+    def _cpt_remove(self, name):
+
+        cpt = self._elements.pop(name)
+        if cpt.type == 'W' or cpt.equipotential_nodes != ():
+            # Cannot split groups of equipotential nodes.
+            self.__dict__.pop('_enodes', None)
+        self._version += 1
+        return cpt
+
+    def _name_conflict(self, name):
+        """Return True if name is used for an attribute, node, or namespace.
+        This is equivalent to hasattr(self, name) but avoids the
+        expense of __getattr__ raising an exception."""
+
+        return (name in self.nodes or name in self.namespaces or
+                name + 'anon1' in self._elements or
+                name in self.__dict__ or hasattr(self.__class__, name))
+
     def _namespace_add(self, namespace):
 
         namespace = namespace.strip('.')
@@ -159,15 +219,32 @@ class NetlistMixin(object):
                 namespace += '.'
                 namespaces = namespaces[part].namespaces
             
+    def _cpt_clone(self, cpt):
+        """Add copy of component cpt from another netlist without
+        reparsing it."""
+
+        self.namer.reserve(cpt.type, cpt.name)
+        self._cpt_add(cpt._clone(self))
+
     def copy(self):
         """Create a copy of the netlist"""
 
-        new = self._new()
+        new = self._new_clone()
 
         for cpt in self._elements.values():
-            new._add(cpt._copy())
+            new._cpt_clone(cpt)
         return new        
 
+    def _new_clone(self):
+        """Create empty netlist for copies of the components.  The names
+        already used for anonymous components are reserved so that
+        new anonymous components do not clash with the copies."""
+
+        new = self._new()
+        for kind, names in self.namer.names.items():
+            new.namer.names[kind] = names.copy()
+        return new
+
     def _new(self):
 
         from .circuit import Circuit
@@ -188,11 +265,10 @@ class NetlistMixin(object):
                 self.remove(name1)
             return self
 
-        self._invalidate()
-
         if name not in self._elements:
             raise ValueError('Unknown component: ' + name)
-        self._elements.pop(name)
+        self._changed(self._elements[name], -1)
+        self._cpt_remove(name)
         # TODO, remove nodes that are only connected
         # to this component.
         return self
@@ -201,6 +277,10 @@ class NetlistMixin(object):
     def super_nodes(self):
         """Super nodes are nodes linked by voltage sources."""
 
+        return self._cached('super_nodes', self._super_nodes)
+
+    def _super_nodes(self):
+
         snodes = []
 
         for elt in self.elements.values():
@@ -219,16 +299,28 @@ class NetlistMixin(object):
         This returns a dictionary keyed by the unique node names with
         values being lists of nodes of the same potential."""
 
+        return self._cached('equipotential_nodes', self._equipotential_nodes)
+
+    def _enodes_make(self):
+        """Return equipotential nodes; these are updated as components
+        are added."""
+
+        if '_enodes' in self.__dict__:
+            return self._enodes
+
         enodes = EquipotentialNodes()
         enodes.add(self.nodes.keys())
 
         # Then augment with nodes connected by wires.
-        for m, elt in enumerate(self.elements.values()):
-            if elt.type == 'W':
-                enodes.add_wire(*elt.nodenames)
-            else:
-                for connections in elt.equipotential_nodes:
-                    enodes.add_wires([elt.name + '.' + n for n in connections])
+        for elt in self.elements.values():
+            enodes.add_cpt(elt)
+
+        self._enodes = enodes
+        return enodes
+
+    def _equipotential_nodes(self):
+
+        enodes = self._enodes_make()
 
         # Alter keys to avoid underscore and to ensure that have a '0'
         # key if possible.
@@ -248,8 +340,9 @@ class NetlistMixin(object):
         """Create dictionary mapping node names to the unique
         equipotential node names."""
 
-        if hasattr(self, '_node_map'):
-            return self._node_map
+        return self._cached('node_map', self._node_map)
+
+    def _node_map(self):
 
         enodes = self.equipotential_nodes
 
@@ -260,7 +353,6 @@ class NetlistMixin(object):
             for node in nodes:
                 node_map[node] = key
 
-        self._node_map = node_map
         return node_map
 
     def annotate_current(self, cpts, var=None, flow=False, pos=''):
@@ -377,8 +469,9 @@ class NetlistMixin(object):
         """Determine list of sorted unique node names, e.g.,
         ['0', '1', '2']."""
 
-        if hasattr(self, '_node_list'):
-            return self._node_list
+        return self._cached('node_list', self._node_list)
+
+    def _node_list(self):
 
         # Extract unique nodes.
         node_list = list(self.equipotential_nodes.keys())
@@ -387,7 +480,6 @@ class NetlistMixin(object):
         if '0' in node_list:
             node_list.insert(0, node_list.pop(node_list.index('0')))
 
-        self._node_list = node_list
         return node_list
 
     @property
@@ -395,14 +487,15 @@ class NetlistMixin(object):
         """Determine list of names of branch elements, e.g.,
         ['C1', 'V1', 'R1', 'R2'b]."""
 
-        if hasattr(self, '_branch_list'):
-            return self._branch_list
+        return self._cached('branch_list', self._branch_list)
+
+    def _branch_list(self):
 
-        self._branch_list = []
+        branch_list = []
         for key, elt in self.elements.items():
             if elt.type not in ('W', 'O', 'P', 'K'):
-                self._branch_list.append(elt.name)                
-        return self._branch_list
+                branch_list.append(elt.name)                
+        return branch_list
 
     def _check_nodes(self, *nodes):
 
@@ -442,6 +535,13 @@ class NetlistMixin(object):
 
         Np, Nm = self._parse_node_args(Np, Nm)
         Np, Nm = self._check_nodes(Np, Nm)
+
+        try:
+            Isc = self._Isc(Np, Nm)
+        except ValueError:
+            Isc = None
+        if Isc is not None:
+            return Isc
         
         new = self.copy()
         if new.is_causal:
@@ -518,6 +618,153 @@ class NetlistMixin(object):
         return elts
 
     
+    def _dp_sub(self):
+        """Return the analysed s-domain subnetlist for the circuit with
+        its independent sources killed or None if this has no ground
+        node.  This is shared by the driving-point and port
+        parameter methods."""
+
+        from .subnetlist import SubNetlist
+
+        if not hasattr(self, '_dpsub'):
+            new = self.kill()
+            if '0' not in new.nodes:
+                return None
+            self._dpsub = SubNetlist(new, 's')
+            self._dpcolumns = {}
+
+        sub = self._dpsub
+        if not hasattr(sub, '_A'):
+            sub._analyse()
+        return sub
+
+    def _port_params(self, ports, kind='Z'):
+        """Return the Z-parameters (kind 'Z') or Y-parameters (kind 'Y')
+        as a sympy matrix for the ports defined by a list of node
+        pairs.
+
+        All the ports are excited at once using a multi-column
+        right-hand side for the MNA system of the killed circuit.  For
+        the Z-parameters, a unit current is applied to each port in
+        turn and the port voltages are measured.  For the
+        Y-parameters, the port voltages are additional constraints
+        with the port currents as additional unknowns.  A
+        ValueError is raised if the system is singular."""
+
+        from .subnetlist import SubNetlist
+
+        sub = self._dp_sub()
+        if sub is None:
+            net = self.kill()
+            net.add('W %s 0' % ports[0][1])
+            sub = SubNetlist(net, 's')
+            sub._analyse()
+
+        N = sub._A.shape[0]
+        M = len(ports)
+
+        # Port incidence matrix.
+        B = sym.zeros(N, M)
+        for col, (Np, Nm) in enumerate(ports):
+            for node, sign in ((Np, 1), (Nm, -1)):
+                index = sub._node_index(node)
+                if index >= 0:
+                    B[index, col] += sign
+
+        if kind == 'Z':
+            P = B.T * matrix_solve(sub._A, B)
+        else:
+            A = sub._A.row_join(B).col_join(B.T.row_join(sym.zeros(M, M)))
+            E = sym.zeros(N, M).col_join(sym.eye(M))
+            # Negate currents since the port constraints act as sources.
+            P = -matrix_solve(A, E)[N:, :]
+
+        P = symsimplify(P)
+        return P.subs(sub.context.symbols)
+
+    def _ports(self, nodes):
+
+        nodes = self._check_nodes(*nodes)
+        if len(nodes) % 2 == 1:
+            raise ValueError('Need an even number of nodes.')
+        ports = []
+        for m in range(len(nodes) // 2):
+            ports.append((nodes[m * 2], nodes[m * 2 + 1]))
+        return ports
+
+    def _dp_impedance(self, Np, Nm):
+        """Return driving-point s-domain impedance between nodes Np and Nm
+        as a sympy expression or None if this cannot be found directly.
+
+        The killed circuit is analysed once and the impedance is found
+        from the columns of the inverse of its MNA matrix that
+        correspond to the two nodes, Z = (e_p - e_m)^T A^-1 (e_p - e_m).
+        The columns are remembered so other node pairs and the
+        short-circuit currents do not require the circuit to be
+        modified and solved again."""
+
+        sub = self._dp_sub()
+        if sub is None:
+            return None
+
+        def column(node):
+
+            index = sub._node_index(node)
+            if index not in self._dpcolumns:
+                e = sym.zeros(sub._A.shape[0], 1)
+                e[index] = 1
+                self._dpcolumns[index] = matrix_solve(sub._A, e)
+            return index, self._dpcolumns[index]
+
+        Z = 0
+        for node1, sign1 in ((Np, 1), (Nm, -1)):
+            if sub._node_index(node1) < 0:
+                continue
+            index1, x = column(node1)
+            for node2, sign2 in ((Np, 1), (Nm, -1)):
+                index2 = sub._node_index(node2)
+                if index2 >= 0:
+                    Z += sign1 * sign2 * x[index2]
+
+        Z = symsimplify(sym.sympify(Z))
+        return Z.subs(sub.context.symbols)
+
+    def _Isc(self, Np, Nm):
+        """Return short-circuit current between nodes Np and Nm found
+        from the open-circuit voltage and the driving-point impedance,
+        Isc = Voc / Z, for each transform domain or None if this
+        cannot be used."""
+
+        from .current import Current, Itype
+
+        Zoc = self._dp_impedance(Np, Nm)
+        if Zoc is None or Zoc == 0:
+            return None
+        Zoc = Impedance(Zoc, kind='s')
+
+        if self.kind == 'super':
+            subs = self.sub.items()
+        else:
+            subs = [(self.kind, self)]
+
+        result = Current()
+        for kind, sub in subs:
+            # Noise and time-domain analyses need the full analysis.
+            if (isinstance(kind, str) and
+                (kind[0] == 'n' or kind in ('t', 'time'))):
+                return None
+            Vd = sub.get_Vd(Np, Nm)
+            # Cancel the common factors of Voc and Z first so that
+            # the result has the same compact form as from a re-solve.
+            I = symsimplify(sym.cancel(Vd.expr / Zoc._selectexpr(kind)))
+            if I.has(sym.nan, sym.zoo, sym.oo):
+                return None
+            result.add(Itype(kind)(I, **Vd.assumptions).simplify())
+
+        if self.kind == 'super':
+            return result
+        return result.select(self.kind)
+
     def admittance(self, Np, Nm=None):
         """Return driving-point admittance between nodes
         Np and Nm with independent sources killed and initial
@@ -527,6 +774,13 @@ class NetlistMixin(object):
 
         Np, Nm = self._parse_node_args(Np, Nm)
         Np, Nm = self._check_nodes(Np, Nm)
+
+        try:
+            Z = self._dp_impedance(Np, Nm)
+        except ValueError:
+            Z = None
+        if Z is not None and Z != 0:
+            return Admittance(1 / Z, kind=self.kind).canonical()
         
         new = self.kill()
         if '0' not in new.nodes:
@@ -549,6 +803,13 @@ class NetlistMixin(object):
 
         Np, Nm = self._parse_node_args(Np, Nm)
         Np, Nm = self._check_nodes(Np, Nm)        
+
+        try:
+            Z = self._dp_impedance(Np, Nm)
+        except ValueError:
+            Z = None
+        if Z is not None:
+            return Impedance(Z, kind=self.kind).canonical()
         
         new = self.kill()
         if '0' not in new.nodes:
@@ -618,49 +879,22 @@ class NetlistMixin(object):
         See also  Bparams, Gparams, Hparams, Sparams, Tparams, Yparams, and Zparams.
         """
 
-        from .twoport import AMatrix
-
-        N1p, N1m, N2p, N2m = self._check_nodes(N1p, N1m, N2p, N2m)        
-        net = self.kill()        
-        if '0' not in net.nodes:
-            net.add('W %s 0' % N1m)                           
-
-        try:
-            net.add('V1_ %s %s {DiracDelta(t)}' % (N1p, N1m))
-
-            # A11 = V1 / V2 with I2 = 0
-            # Apply V1 and measure V2 with port 2 open-circuit
-            A11 = LaplaceDomainTransferFunction(net.V1_.V(s) / net.Voc(N2p, N2m)(s))
+        from .twoport import ZMatrix, YMatrix
 
-            # A12 = V1 / I2 with V2 = 0
-            # Apply V1 and measure I2 with port 2 short-circuit
-            A12 = LaplaceDomainImpedance(net.V1_.V(s) / net.Isc(N2p, N2m)(s))
+        ports = self._ports((N1p, N1m, N2p, N2m))
 
-            net.remove('V1_')
-
-            net.add('I1_ %s %s {DiracDelta(t)}' % (N1p, N1m))
-
-            # A21 = I1 / V2 with I2 = 0
-            # Apply I1 and measure V2 with port 2 open-circuit
+        # Use the Z-parameters if they exist since these do not
+        # require the additional port unknowns; otherwise try the
+        # Y-parameters, say for a series element.
+        for kind, cls in (('Z', ZMatrix), ('Y', YMatrix)):
             try:
-                A21 = LaplaceDomainAdmittance(1 / net.Voc(N2p, N2m)(s))                
+                P = self._port_params(ports, kind)
             except ValueError:
-                # It is likely there is an open-circuit.                
-                net2 = net.copy()
-                net2.add('W %s %s' % (N2p, N2m))
-                A21 = LaplaceDomainAdmittance(-net2.I1_.I(s) / net2.Voc(N2p, N2m)(s))
-                A21 = 0                
-
-            # A22 = I1 / I2 with V2 = 0
-            # Apply I1 and measure I2 with port 2 short-circuit
-            A22 = LaplaceDomainTransferFunction(1 / net.Isc(N2p, N2m)(s))
-
-            net.remove('I1_')
-            A = AMatrix(((A11, A12), (A21, A22)))
-            return A
+                continue
+            if P[1, 0] != 0:
+                return cls(P).Aparams.simplify()
 
-        except ValueError:
-            raise ValueError('Cannot create A matrix')
+        raise ValueError('Cannot create A matrix')
 
     def Bparams(self, N1p, N1m, N2p, N2m):
         """Create B-parameters for two-port defined by nodes N1p, N1m, N2p, and N2m, where:
@@ -715,7 +949,7 @@ class NetlistMixin(object):
 
         See also  Aparams, Bparams, Gparams, Hparams, Sparams, Yparams, and Zparams.
         """
-        return self.Tparams(N1p, N1m, N2p, N2m).Hparams
+        return self.Aparams(N1p, N1m, N2p, N2m).Tparams
 
     def Yparams(self, N1p, N1m, N2p, N2m):
         """Create Y-parameters for two-port defined by nodes N1p, N1m, N2p, and N2m, where:
@@ -726,7 +960,13 @@ class NetlistMixin(object):
 
         See also  Aparams, Bparams, Gparams, Hparams, Sparams, Tparams, and Zparams.
         """
-        return self.Zparams(N1p, N1m, N2p, N2m).Yparams            
+        from .twoport import YMatrix
+
+        ports = self._ports((N1p, N1m, N2p, N2m))
+        try:
+            return YMatrix(self._port_params(ports, 'Y'))
+        except ValueError:
+            raise ValueError('Cannot create Y matrix')
 
     def Zparams(self, N1p, N1m, N2p, N2m):
         """Create Z-parameters for two-port defined by nodes N1p, N1m, N2p, and N2m, where:
@@ -739,41 +979,9 @@ class NetlistMixin(object):
         """
         from .twoport import ZMatrix
 
-        # TODO, generalise to multiports.
-        
-        N1p, N1m, N2p, N2m = self._check_nodes(N1p, N1m, N2p, N2m)        
-        net = self.kill()
-        if '0' not in net.nodes:
-            net.add('W %s 0' % N1m)
-
+        ports = self._ports((N1p, N1m, N2p, N2m))
         try:
-            net.add('I1_ %s %s {DiracDelta(t)}' % (N1p, N1m))
-
-            # Z11 = V1 / I1 with I2 = 0
-            # Apply I1 and measure V1 with port 2 open-circuit
-            Z11 = LaplaceDomainImpedance(net.Voc(N1p, N1m)(s))
-
-            # Z21 = V2 / I1 with I2 = 0
-            # Apply I1 and measure V2 with port 2 open-circuit
-            Z21 = LaplaceDomainImpedance(net.Voc(N2p, N2m)(s))          
-
-            net.remove('I1_')
-
-            net.add('I2_ %s %s {DiracDelta(t)}' % (N2p, N2m))
-
-            # Z12 = V1 / I2 with I1 = 0
-            # Apply I2 and measure V1 with port 1 open-circuit
-            Z12 = LaplaceDomainImpedance(net.Voc(N1p, N1m)(s))
-
-            # Z22 = V2 / I2 with I1 = 0
-            # Apply I2 and measure V2 with port 1 open-circuit
-            Z22 = LaplaceDomainImpedance(net.Voc(N2p, N2m)(s))          
-
-            net.remove('I2_')            
-
-            Z = ZMatrix(((Z11, Z12), (Z21, Z22)))
-            return Z
-
+            return ZMatrix(self._port_params(ports, 'Z'))
         except ValueError:
             raise ValueError('Cannot create Z matrix')
 
@@ -784,36 +992,11 @@ class NetlistMixin(object):
 
         """
 
-        nodes = self._check_nodes(*nodes)
-        if len(nodes) % 2 == 1:
-            raise ValueError('Need an even number of nodes.')
-        ports = []
-        for m in range(len(nodes) // 2):
-            ports.append((nodes[m * 2], nodes[m * 2 + 1]))
-        
-        net = self.kill()
-        if '0' not in net.nodes:
-            net.add('W %s 0' % nodes[1])
+        from .smatrix import LaplaceDomainAdmittanceMatrix
 
+        ports = self._ports(nodes)
         try:
-
-            Y = Matrix.zeros(len(ports))
-            
-            for col in range(len(ports)):
-
-                for row in range(len(ports)):
-                    if row == col:
-                        net.add('V%d_ %s %s {DiracDelta(t)}' % (row, ports[row][0], ports[row][1]))
-                    else:
-                        net.add('V%d_ %s %s 0' % (row, ports[row][0], ports[row][1]))                        
-
-                for row in range(len(ports)):
-                    Y[row, col] = LaplaceDomainAdmittance(net.elements['V%d_' % row].I(s))
-
-                for row in range(len(ports)):                        
-                    net.remove('V%d_' % row)
-            return Y
-
+            return LaplaceDomainAdmittanceMatrix(self._port_params(ports, 'Y'))
         except ValueError:
             raise ValueError('Cannot create Y matrix')
 
@@ -841,32 +1024,13 @@ class NetlistMixin(object):
 
         """
 
-        nodes = self._check_nodes(*nodes)
-        if len(nodes) % 2 == 1:
-            raise ValueError('Need an even number of nodes.')
-        ports = []
-        for m in range(len(nodes) // 2):
-            ports.append((nodes[m * 2], nodes[m * 2 + 1]))
-        
-        net = self.kill()
-        if '0' not in net.nodes:
-            net.add('W %s 0' % nodes[1])
+        from .smatrix import LaplaceDomainImpedanceMatrix
 
+        ports = self._ports(nodes)
         try:
-
-            Z = Matrix.zeros(len(ports))
-            
-            for col in range(len(ports)):
-                net.add('I_ %s %s {DiracDelta(t)}' % (ports[col][0], ports[col][1]))
-
-                for row in range(len(ports)):                
-                    Z[row, col] = LaplaceDomainImpedance(net.Voc(ports[row][0], ports[row][1])(s))
-
-                net.remove('I_')
-            return Z
-
+            return LaplaceDomainImpedanceMatrix(self._port_params(ports, 'Z'))
         except ValueError:
-            raise ValueError('Cannot create Z matrix')        
+            raise ValueError('Cannot create Z matrix')
 
     def Zparams3(self, N1p, N1m, N2p, N2m, N3p, N3m):
         """Create Z-parameters for three-port defined by nodes N1p, N1m, N2p,
@@ -898,19 +1062,18 @@ class NetlistMixin(object):
 
         """
 
-        new = self._new()
+        new = self._new_clone()
 
         for cpt in self._elements.values():
             if cpt.independent_source:
-                net = cpt._select(kind)                
+                new._add(cpt._select(kind))
             else:
-                net = cpt._copy()
-            new._add(net)
+                new._cpt_clone(cpt)
         return new        
 
     def _kill(self, sourcenames):
 
-        new = self._new()
+        new = self._new_clone()
 
         for cpt in self._elements.values():
             if cpt.name in sourcenames:
@@ -918,9 +1081,9 @@ class NetlistMixin(object):
                     net = cpt._zero()                
                 else:
                     net = cpt._kill()
+                new._add(net)
             else:
-                net = cpt._copy()                
-            new._add(net)
+                new._cpt_clone(cpt)
         return new        
 
     def kill_except(self, *args):
@@ -1027,12 +1190,8 @@ class NetlistMixin(object):
         """Generate graph for this netlist."""        
 
         from .circuitgraph import CircuitGraph
-        
-        if hasattr(self, '_G'):
-            return self._G
 
-        self._G = CircuitGraph(self)
-        return self._G
+        return self._cached('G', lambda: CircuitGraph(self))
     
     def _potential_combine_names(self):
 
@@ -1182,7 +1341,10 @@ class NetlistMixin(object):
             # Remove component
             elt = self._parse(net1)
             net.elements[name1] = elt
-                
+
+        # The elements have been replaced in place so the derived
+        # values, such as the equipotential nodes, are stale.
+        net._invalidate()
         return True
 
     def _check_ic(self, subset):
@@ -1213,6 +1375,7 @@ class NetlistMixin(object):
         for k, v in self.elements.items():
             newelements[v.name] = v
         self._elements = newelements
+        self._invalidate()
     
     def _simplify_series(self, cptnames=None, explain=False):
 
@@ -1378,11 +1541,14 @@ class NetlistMixin(object):
     def subs(self, subs_dict):
         """Substitute values using dictionary of subsitutions."""        
 
-        new = self._new()
+        new = self._new_clone()
 
+        names = [str(key) for key in subs_dict]
         for cpt in self._elements.values():
-            net = cpt._subs(subs_dict)
-            new._add(net)
+            if cpt._has_symbols(names):
+                new._add(cpt._subs(subs_dict))
+            else:
+                new._cpt_clone(cpt)
         return new                        
     
     def initialize(self, cct, time):
@@ -138,10 +138,16 @@ class DiscreteTimeDomainExpression(SequenceExpression):
 
         return self.__class__(limit(self.expr, self.var, oo))
 
-    def DFT(self, N=None, evaluate=True):
+    def DFT(self, N=None, evaluate=True, numeric=False):
+        """Compute discrete Fourier transform.  If `numeric` is True,
+        the expression is evaluated for n = 0, ..., N - 1 and the DFT
+        is computed with numpy.fft; the result is a sequence."""
 
         from .kexpr import k
 
+        if numeric:
+            return self._numeric_dft(N, k)
+
         if N is None:
             from .sym import sympify
             
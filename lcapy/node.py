@@ -8,6 +8,9 @@ from .immittancemixin import ImmittanceMixin
 
 class Node(ImmittanceMixin):
 
+    __slots__ = ('cct', 'name', 'pos', 'port', 'rootname', 'primary',
+                 '_connected')
+
     def __init__(self, cct, name):
 
         self.cct = cct
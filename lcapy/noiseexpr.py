@@ -6,6 +6,21 @@ from .state import state
 from .expr import Expr
 import sympy as sym
 import numpy as np
+from functools import lru_cache
+from warnings import warn
+
+
+@lru_cache(maxsize=256)
+def _psd_func(expr):
+    """Return function to evaluate the one-sided power spectral density
+    for an array of frequencies (in Hz) given the amplitude spectral
+    density expr in terms of f.  The functions for the most recently
+    used expressions are cached."""
+
+    # Use floating point coefficients to avoid overflow of large
+    # integers.
+    return sym.lambdify(fsym, (sym.Abs(expr)**2).evalf(), 'numpy')
+
 
 class NoiseExpression(Expr):
     """Frequency domain (one-sided) noise spectrum expression (amplitude
@@ -147,40 +162,182 @@ class NoiseExpression(Expr):
     def __ne__(self, x):
         return not (self == x)
 
-    def rms(self):
-        """Calculate rms value."""
+    def rms(self, fmin=0, fmax=sym.oo, numeric=False):
+        """Calculate rms value by integrating the power spectral density
+        from frequency fmin to fmax (in Hz).  If numeric is True, the
+        power spectral density is integrated numerically; this is
+        much faster for the noise spectra of circuits with many
+        poles."""
 
-        P = sym.integrate(self.expr**2, (self.var, 0, sym.oo))
+        if numeric:
+            rms = np.sqrt(self._integrate_numeric(fmin, fmax))
+            if not np.isfinite(rms):
+                rms = sym.oo
+            return self._fourier_conjugate_class(rms)
+
+        if self.var == omegasym:
+            fmin *= 2 * sym.pi
+            fmax *= 2 * sym.pi
+        P = sym.integrate(self.expr**2, (self.var, fmin, fmax))
         if self.var == omegasym:
             P /= 2 * sym.pi
         rms = sym.sqrt(P)
         # TODO: Use rms class?
         return self._fourier_conjugate_class(rms)
 
-    def sample(self, t):
+    def _psd_func(self):
+        """Return function to evaluate the one-sided power spectral
+        density for an array of frequencies (in Hz)."""
+
+        expr = self(f).expr
+        symbols = set([symbol.name for symbol in expr.free_symbols])
+        symbols -= set((fsym.name, ))
+        if symbols != set():
+            raise ValueError('Undefined symbols %s in expression %s' %
+                             (tuple(symbols), self))
+
+        return _psd_func(expr)
+
+    def _integrate_numeric(self, fmin=0, fmax=sym.oo, rtol=1e-8):
+        """Numerically integrate the power spectral density from
+        frequency fmin to fmax.  The integration is performed with
+        respect to log frequency using Simpson's rule on an
+        increasingly dense log-spaced grid until the result
+        converges.  A warning is issued if the result has not
+        converged."""
+
+        func = self._psd_func()
+
+        def integrand(u):
+            # Integrand with respect to u = ln(f).
+            vf = np.exp(u)
+            with np.errstate(all='ignore'):
+                v = np.broadcast_to(np.asarray(func(vf), dtype=float),
+                                    vf.shape) * vf
+            return np.where(np.isfinite(v), v, np.inf)
+
+        fmin = float(fmin)
+        fmax = float(fmax)
+        if fmin < 0 or fmax <= fmin:
+            raise ValueError('Invalid frequency range %s to %s' % (fmin, fmax))
+
+        # Find the range of frequencies that contribute using a
+        # coarse grid.
+        umin = np.log(fmin) if fmin > 0 else np.log(1e-30)
+        umax = np.log(fmax) if np.isfinite(fmax) else np.log(1e30)
+        u = np.linspace(umin, umax, max(int(4 * (umax - umin)), 2))
+        v = integrand(u)
+        if not np.isfinite(v).all():
+            return np.inf
+
+        vmax = v.max()
+        if vmax == 0:
+            return 0.0
+        significant = np.flatnonzero(v > 1e-12 * vmax)
+        if ((fmin == 0 and significant[0] == 0) or
+            (not np.isfinite(fmax) and significant[-1] == len(u) - 1)):
+            # Spectrum does not roll off fast enough.
+            return np.inf
+
+        m1 = max(significant[0] - 1, 0)
+        m2 = min(significant[-1] + 1, len(u) - 1)
+        a, b = u[m1], u[m2]
+
+        N = 64
+        P = None
+        while N <= 2 ** 20:
+            u = np.linspace(a, b, N + 1)
+            v = integrand(u)
+            h = (b - a) / N
+            Pnew = h / 3 * (v[0] + v[-1] + 4 * v[1:-1:2].sum() +
+                            2 * v[2:-1:2].sum())
+            if P is not None and abs(Pnew - P) <= rtol * abs(Pnew):
+                return Pnew
+            P = Pnew
+            N *= 2
+
+        warn('Numerical integration of %s has not converged' % self)
+        return Pnew
+
+    def _shaping_filter(self, fs, numtaps):
+        """Return impulse response of FIR filter with numtaps
+        coefficients that shapes white noise of unit variance to have
+        the amplitude spectral density of the noise process when
+        sampled at rate fs."""
+
+        vf = np.arange(numtaps // 2 + 1) * fs / numtaps
+        An = self(f).evaluate(vf)
+        An = np.broadcast_to(np.abs(An), vf.shape)
+        # Ignore infinite values, say at DC for 1 / f noise.
+        An = np.where(np.isfinite(An), An, 0)
+
+        # The power of the white noise is spread over the bandwidth
+        # fs / 2 of the one-sided spectrum.
+        h = np.fft.irfft(An * np.sqrt(fs / 2), numtaps)
+        return np.roll(h, numtaps // 2)
+
+    def sample_blocks(self, fs, blocksize=4096, seed=None, numtaps=1024):
+        """Generator of a sample function (realisation) of the noise
+        process sampled at rate fs.  This produces an arbitrarily
+        long realisation in blocks of blocksize samples.  White noise
+        is filtered by a FIR shaping filter with numtaps coefficients,
+        determined from the spectral density, using overlap-add.
+
+        seed is used to seed the random number generator for a
+        reproducible realisation.  For example,
+
+        >>> blocks = Vnoisy(3).sample_blocks(fs=1e3, seed=42)
+        >>> y1 = next(blocks)
+        >>> y2 = next(blocks)"""
+
+        if blocksize < 1:
+            raise ValueError('Require positive blocksize')
+        if numtaps < 2:
+            raise ValueError('Require at least 2 taps')
+
+        h = self._shaping_filter(fs, numtaps)
+        rng = np.random.default_rng(seed)
+
+        # The first call to process fills the filter with numtaps - 1
+        # samples and this may be more than blocksize.
+        nfft = 1 << int(np.ceil(np.log2(max(blocksize, numtaps - 1) +
+                                        numtaps - 1)))
+        H = np.fft.rfft(h, nfft)
+        overlap = np.zeros(numtaps - 1)
+
+        def process(N):
+            nonlocal overlap
+
+            x = rng.standard_normal(N)
+            y = np.fft.irfft(np.fft.rfft(x, nfft) * H, nfft)
+            y = y[0:N + numtaps - 1]
+            y[0:numtaps - 1] += overlap
+            overlap = y[N:].copy()
+            return y[0:N]
+
+        # Fill filter to avoid initial transient.
+        process(numtaps - 1)
+
+        while True:
+            yield process(blocksize)
+
+    def sample(self, t, seed=None):
         """Return a sample function (realisation) of the noise process
-        evaluated at time values specified by vector t."""
+        evaluated at time values specified by vector t.  seed is used
+        to seed the random number generator for a reproducible
+        realisation.  See also sample_blocks."""
 
         N = len(t)
         if N < 3:
             raise ValueError('Require at least 3 samples')
-        if N & 1:
-            raise ValueError('Require even number of samples')                    
         
         td = np.diff(t)
         if not np.allclose(np.diff(td), 0):
             raise ValueError('Require uniform sampling')
 
-        fs = 1 / td[0]
-        vf = np.arange(N // 2 + 1) * fs / N
-        Sn = self(f).evaluate(vf)
-    
-        x = np.random.randn(N)
-        X = np.fft.rfft(x)
-        
-        Y = X * np.sqrt(Sn * fs / 2)
-        y = np.fft.irfft(Y)
-        return y
+        blocks = self.sample_blocks(1 / td[0], blocksize=N, seed=seed,
+                                    numtaps=N)
+        return next(blocks)
 
     def time(self):
         print('Warning: no time representation for noise expression'
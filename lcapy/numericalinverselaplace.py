@@ -0,0 +1,149 @@
+"""This module provides numerical inverse Laplace transforms.  These
+evaluate the time-domain signal directly from the s-domain expression
+without finding a symbolic inverse Laplace transform.  This is useful
+for high order or non-rational expressions, say with fractional powers
+of s.
+
+The s-domain expression is specified as a function F that is
+vectorized over arrays of complex s values.
+
+These functions are for internal use by Lcapy.
+
+Copyright 2020 Michael Hayes, UCECE
+
+"""
+
+import numpy as np
+
+__all__ = ('numerical_inverse_laplace', )
+
+
+def _evaluate(F, s):
+    """Evaluate F at s, broadcasting constants."""
+
+    return np.broadcast_to(F(s), s.shape).astype(complex)
+
+
+def inverse_laplace_talbot(F, t, N=None):
+    """Fixed Talbot method of Abate and Valko for t > 0.  N is the number
+    of points along the Talbot contour."""
+
+    if N is None:
+        N = 32
+
+    t = np.asarray(t, dtype=float)
+
+    # Contour parameter.
+    r = 2 * N / (5 * t)
+
+    theta = np.pi * np.arange(1, N) / N
+    cot = 1 / np.tan(theta)
+    sigma = theta + (theta * cot - 1) * cot
+
+    # Points on contour, one row per time.
+    s = r[:, None] * theta * (cot + 1j)
+
+    Fs = _evaluate(F, s)
+    F0 = _evaluate(F, r + 0j)
+
+    terms = np.exp(t[:, None] * s) * Fs * (1 + 1j * sigma)
+    result = 0.5 * np.exp(r * t) * F0 + np.sum(terms, axis=1)
+    return (r / N * result).real
+
+
+def inverse_laplace_dehoog(F, t, N=None, alpha=0, tol=1e-9):
+    """Method of de Hoog, Knight, and Stokes using a quotient-difference
+    accelerated Fourier series for t > 0.  The accuracy degrades for
+    times much smaller than the period of the Fourier series so the
+    times are split into decades, each sharing 2 * N + 1 samples of F."""
+
+    if N is None:
+        N = 20
+
+    t = np.asarray(t, dtype=float)
+    decades = np.floor(np.log10(t))
+
+    result = np.zeros(t.shape)
+    for decade in np.unique(decades):
+        index = decades == decade
+        result[index] = _inverse_laplace_dehoog(F, t[index], N, alpha, tol)
+    return result
+
+
+def _inverse_laplace_dehoog(F, t, M, alpha, tol):
+
+    # Period of the Fourier series.
+    T = 2 * t.max()
+    gamma = alpha - np.log(tol) / (2 * T)
+
+    s = gamma + 1j * np.pi * np.arange(2 * M + 1) / T
+    a = _evaluate(F, s).copy()
+    a[0] /= 2
+
+    # Quotient-difference algorithm.
+    e = np.zeros((2 * M + 1, M + 1), dtype=complex)
+    q = np.zeros((2 * M, M + 1), dtype=complex)
+
+    q[:, 1] = a[1:] / a[:-1]
+    for r in range(1, M + 1):
+        m = 2 * (M - r)
+        e[0:m + 1, r] = q[1:m + 2, r] - q[0:m + 1, r] + e[1:m + 2, r - 1]
+        if r < M:
+            m = 2 * (M - r - 1)
+            q[0:m + 2, r + 1] = (q[1:m + 3, r] * e[1:m + 3, r] /
+                                 e[0:m + 2, r])
+
+    # Continued fraction coefficients.
+    d = np.zeros(2 * M + 1, dtype=complex)
+    d[0] = a[0]
+    d[1:2 * M:2] = -q[0, 1:M + 1]
+    d[2:2 * M + 1:2] = -e[0, 1:M + 1]
+
+    # Evaluate continued fraction with recurrence.
+    z = np.exp(1j * np.pi * t / T)
+    A = np.zeros((2 * M + 2, len(t)), dtype=complex)
+    B = np.zeros((2 * M + 2, len(t)), dtype=complex)
+    A[1] = d[0]
+    B[0:2] = 1
+    for n in range(2, 2 * M + 1):
+        A[n] = A[n - 1] + d[n - 1] * z * A[n - 2]
+        B[n] = B[n - 1] + d[n - 1] * z * B[n - 2]
+
+    # Accelerate convergence of the remainder.
+    h2M = 0.5 * (1 + (d[2 * M - 1] - d[2 * M]) * z)
+    R2Mz = -h2M * (1 - np.sqrt(1 + d[2 * M] * z / h2M**2))
+    A[2 * M + 1] = A[2 * M] + R2Mz * A[2 * M - 1]
+    B[2 * M + 1] = B[2 * M] + R2Mz * B[2 * M - 1]
+
+    return (np.exp(gamma * t) * (A[2 * M + 1] / B[2 * M + 1]).real) / T
+
+
+methods = {'talbot': inverse_laplace_talbot,
+           'dehoog': inverse_laplace_dehoog}
+
+
+def numerical_inverse_laplace(F, t, method='talbot', N=None):
+    """Numerically evaluate the inverse Laplace transform of F at the
+    times t.  F must accept and return arrays of complex values.
+
+    `method` can be 'talbot' or 'dehoog'.  `N` specifies the number of
+    terms used by the method.
+
+    The result is zero for t < 0 and NaN for t = 0 since the methods
+    are only valid for t > 0."""
+
+    try:
+        invlaplace = methods[method]
+    except KeyError:
+        raise ValueError('Unknown method %s, must be %s' %
+                         (method, ', '.join(methods.keys())))
+
+    t = np.atleast_1d(np.asarray(t, dtype=float))
+
+    result = np.zeros(t.shape)
+    result[t == 0] = np.nan
+
+    tpos = t > 0
+    if tpos.any():
+        result[tpos] = invlaplace(F, t[tpos], N)
+    return result
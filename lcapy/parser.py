@@ -7,13 +7,25 @@ Copyright 2015--2020 Michael Hayes, UCECE
 
 import re
 
-# Could use a script to generate parser and parsing tables if speed
-# was important.
+# The parsing tables are generated once for each grammar and cached.
+
+# Compiled patterns for splitting strings, keyed by delimiters.
+split_patterns = {}
+
 
 def split(s, delimiters):
     """Split string by specified delimiters but not if a delimiter is
     within curly brackets {} or ""."""
 
+    if '{' not in s and '"' not in s:
+        # Fast path using compiled pattern when there are no brackets.
+        try:
+            pattern = split_patterns[delimiters]
+        except KeyError:
+            pattern = re.compile('[%s]+' % re.escape(delimiters))
+            split_patterns[delimiters] = pattern
+        return [part for part in pattern.split(s) if part != '']
+
     parts = []
     current = []
     close_bracket = ''
@@ -109,26 +121,20 @@ class Rule(object):
         return tuple(nodes), args
 
 
-class Parser(object):
+class ParserTables(object):
+    """Parsing tables for a grammar.  These are created once for each
+    grammar and shared by all the parsers using the grammar."""
 
-    def __init__(self, cpts, grammar, allow_anon=False):
-        """cpts is a module containing a class for each component
-        grammar is a module defining the syntax of a netlist"""
+    def __init__(self, grammar):
 
         # A string defining the syntax for a netlist
         rules = grammar.rules
         # A string defining parameters
         params = grammar.params
-        # A string defining delimiter characters
-        self.delimiters = grammar.delimiters
-        # A string defining comment characters
-        self.comments = grammar.comments
-        self.allow_anon = allow_anon
 
-        self.cpts = cpts
         self.paramdict = {}
         self.ruledict = {}
-        
+
         for param in params.split('\n'):
             self._add_param(param)
 
@@ -141,6 +147,21 @@ class Parser(object):
         # it cannot include symbols such as + and -.
         self.cpt_pattern = re.compile("(%s)([#_\w'?]+)?" % '|'.join(cpts))
 
+        # For each component type, map the keyword positions to
+        # dictionaries of the rules keyed by keyword.  The rule
+        # index is stored so that the first matching rule is chosen.
+        self.keyworddict = {}
+        for cpt_type, rules in self.ruledict.items():
+            keywords = {}
+            for index, rule in enumerate(rules):
+                if rule.pos is None:
+                    continue
+                if rule.pos not in keywords:
+                    keywords[rule.pos] = {}
+                keywords[rule.pos].setdefault(rule.params[rule.pos],
+                                              (index, rule))
+            self.keyworddict[cpt_type] = keywords
+
     def _add_param(self, string):
 
         if string == '':
@@ -185,6 +206,60 @@ class Parser(object):
         self.ruledict[cpt_type] += (Rule(cpt_type, cpt_classname,
                                         params, comment, pos), )
 
+    def rule(self, cpt_type, fields):
+        """Return the rule, keyword position, and keyword for the
+        component type given the fields.  If no keyword is present,
+        the first rule is chosen."""
+
+        rules = self.ruledict[cpt_type]
+
+        match = None
+        for pos, keywords in self.keyworddict[cpt_type].items():
+            if len(fields) <= pos:
+                continue
+            try:
+                index, rule = keywords[fields[pos].lower()]
+            except KeyError:
+                continue
+            if match is None or index < match[0]:
+                match = index, rule
+
+        if match is None:
+            return rules[0], rules[-1].pos, ''
+        rule = match[1]
+        return rule, rule.pos, rule.params[rule.pos]
+
+
+# Parsing tables keyed by the grammar rules and params.
+parser_tables = {}
+
+
+class Parser(object):
+
+    def __init__(self, cpts, grammar, allow_anon=False):
+        """cpts is a module containing a class for each component
+        grammar is a module defining the syntax of a netlist"""
+
+        # A string defining delimiter characters
+        self.delimiters = grammar.delimiters
+        # A string defining comment characters
+        self.comments = grammar.comments
+        self.allow_anon = allow_anon
+
+        self.cpts = cpts
+
+        key = (grammar.rules, grammar.params)
+        try:
+            tables = parser_tables[key]
+        except KeyError:
+            tables = ParserTables(grammar)
+            parser_tables[key] = tables
+
+        self.tables = tables
+        self.paramdict = tables.paramdict
+        self.ruledict = tables.ruledict
+        self.cpt_pattern = tables.cpt_pattern
+
     def parse(self, string, namespace='', parent=None):
         """Parse string and create object"""
 
@@ -244,16 +319,7 @@ class Parser(object):
         # choose the rule pattern based on a keyword.  If the
         # keyword is not present, default to first rule pattern.
         # Perhaps a factory should sort this out?
-        rule = self.ruledict[cpt_type][0]
-        keyword = ''
-        for rule1 in self.ruledict[cpt_type]:
-            pos = rule1.pos
-            if pos is None:
-                continue
-            if len(fields) > pos and fields[pos].lower() == rule1.params[pos]:
-                rule = rule1
-                keyword = rule1.params[pos]
-                break
+        rule, pos, keyword = self.tables.rule(cpt_type, fields)
 
         defname = namespace + cpt_type + cpt_id
         name = defname
@@ -11,6 +11,7 @@ from .expr import expr
 from .phasor import PhasorVoltage, PhasorCurrent
 from .vector import Vector
 from .phasor import PhasorVoltage, PhasorCurrent
+import numpy as np
 
 
 class PolyphaseVector(Vector):
@@ -128,7 +129,10 @@ class LineCurrentVector(PolyphaseCurrentVector):
     pass
 
 
-def phase_to_line_matrix(N=3):
+def phase_to_line_matrix(N=3, numeric=False):
+
+    if numeric:
+        return _numeric_matrix('line', N)
 
     a = Matrix.zeros(N)
     
@@ -139,14 +143,80 @@ def phase_to_line_matrix(N=3):
     return a
 
 
-def polyphase_decompose_matrix(N=3, expand=False):
+numeric_matrix_cache = {}
+
+
+def _numeric_matrix(kind, N):
+    """Return NumPy array for the polyphase transformation matrix of the
+    specified kind ('decompose', 'compose', or 'line') for N
+    phases.  The arrays are cached and are read-only."""
+
+    key = (kind, N)
+    if key in numeric_matrix_cache:
+        return numeric_matrix_cache[key]
+
+    if kind == 'line':
+        a = np.eye(N) - np.roll(np.eye(N), 1, axis=1)
+    else:
+        # Use the periodicity of the powers of alpha for accuracy.
+        alpha = np.exp(-2j * np.pi * np.arange(N) / N)
+        m = np.arange(N)
+        if kind == 'decompose':
+            a = alpha[np.outer(m, m) % N] / N
+        else:
+            a = alpha[np.outer(-m, m) % N]
+    a.flags.writeable = False
+    numeric_matrix_cache[key] = a
+    return a
+
+
+def _numeric_transform(kind, x):
+
+    x = np.asarray(x)
+    if x.ndim == 0:
+        raise ValueError('Expecting array of shape (samples, N)')
+    a = _numeric_matrix(kind, x.shape[-1])
+    # Transform the phase components in the last axis of x for all
+    # the samples with one matrix product.
+    return x @ a.T
+
+
+def polyphase_decompose(x):
+    """Decompose an array x of numeric phasors of shape (samples, N) into
+    the symmetrical sequence components for N phases.  This applies
+    the matrix found from polyphase_decompose_matrix to each row of x."""
+
+    return _numeric_transform('decompose', x)
+
+
+def polyphase_compose(x):
+    """Compose an array x of numeric symmetrical sequence components
+    of shape (samples, N) into phasors for N phases.  This applies the
+    matrix found from polyphase_compose_matrix to each row of x."""
+
+    return _numeric_transform('compose', x)
+
+
+def phase_to_line(x):
+    """Convert an array x of numeric phase phasors of shape (samples, N)
+    into line phasors."""
+
+    return _numeric_transform('line', x)
+
+
+def polyphase_decompose_matrix(N=3, expand=False, numeric=False):
     """Matrix to decompose vector of phase components into the symmetrical
     sequence components.  The matrix dimension is `N` x `N`.  This
     matrix is equivalent to IDFTmatrix.  The transformation is only
     valid for positive frequency components; the complex conjugate is
     required for negative frequency components.
 
+    If `numeric` is True, a cached NumPy array is returned.
+
     """
+
+    if numeric:
+        return _numeric_matrix('decompose', N)
     
     if expand:
         alpha = polyphase_alpha(N)
@@ -161,15 +231,20 @@ def polyphase_decompose_matrix(N=3, expand=False):
     return a
 
 
-def polyphase_compose_matrix(N=3, expand=False):
+def polyphase_compose_matrix(N=3, expand=False, numeric=False):
     """Matrix to compose symmetrical sequence components into a vector of
     phase components.  The matrix dimension is `N` x `N`.  This matrix
     is equivalent to DFTmatrix.  The transformation is only valid for
     positive frequency components; the complex conjugate is required
     for negative frequency components.
 
+    If `numeric` is True, a cached NumPy array is returned.
+
     """
 
+    if numeric:
+        return _numeric_matrix('compose', N)
+
     if expand:
         alpha = polyphase_alpha(N)
     else:
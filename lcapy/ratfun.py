@@ -5,6 +5,7 @@ Copyright 2016--2020 Michael Hayes, UCECE
 """
 
 from __future__ import division
+import numpy as np
 import sympy as sym
 from sympy.core.mul import _unevaluated_Mul as uMul
 from sympy.core.add import _unevaluated_Add as uAdd
@@ -106,6 +107,55 @@ class Pole(object):
             raise ValueError('Unknown damping %s' % self.damping)
 
 
+def _numeric_coeffs(poly):
+    """Return array of complex coefficients of polynomial poly, highest
+    powers first.  A ValueError is raised if the coefficients cannot
+    be evaluated numerically."""
+
+    try:
+        return np.array([complex(c) for c in poly.all_coeffs()])
+    except TypeError:
+        raise ValueError('Cannot evaluate coefficients of %s numerically'
+                         % poly.as_expr())
+
+
+def _numeric_sympify(value, tol=1e-12):
+    """Convert complex number to SymPy float, removing negligible real or
+    imaginary parts."""
+
+    value = complex(value)
+    mag = abs(value)
+    re = value.real if abs(value.real) > tol * mag else 0
+    im = value.imag if abs(value.imag) > tol * mag else 0
+
+    if im == 0:
+        return sym.Float(re)
+    if re == 0:
+        return sym.I * sym.Float(im)
+    return sym.Float(re) + sym.I * sym.Float(im)
+
+
+def _numeric_roots(poly):
+    """Return dictionary of roots of polynomial poly found numerically.
+    The values are the multiplicity of each root."""
+
+    from scipy.signal import unique_roots
+
+    coeffs = _numeric_coeffs(poly)
+    if len(coeffs) < 2:
+        return {}
+
+    # Use the same tolerance as scipy.signal.residue for repeated roots.
+    roots, multiplicity = unique_roots(np.roots(coeffs), tol=1e-3,
+                                       rtype='avg')
+
+    rootsdict = {}
+    for root, n in zip(roots, multiplicity):
+        root = _numeric_sympify(root)
+        rootsdict[root] = rootsdict.get(root, 0) + int(n)
+    return rootsdict
+
+
 def as_numer_denom_poly(expr, var):
 
     N = sym.S.One
@@ -344,24 +394,30 @@ class Ratfun(object):
     
         return const, undef, rest
     
-    def roots(self):
+    def roots(self, numeric=False):
         """Return roots of expression as a dictionary
-        Note this may not find them all."""
+        Note this may not find them all.
 
+        If numeric is True, the roots are found numerically using the
+        polynomial coefficients.  This is much faster for high order
+        polynomials but requires the coefficients to be numbers."""
+
+        if numeric:
+            return _numeric_roots(sym.Poly(self.expr, self.var))
         return sym.roots(sym.Poly(self.expr, self.var))
 
-    def zeros(self):
+    def zeros(self, numeric=False):
         """Return zeroes of expression as a dictionary
         Note this may not find them all."""
 
-        return Ratfun(self.numerator, self.var).roots()    
+        return Ratfun(self.numerator, self.var).roots(numeric)
 
-    def poles(self, damping=None):
+    def poles(self, damping=None, numeric=False):
         """Return poles of expression as a dictionary of Pole objects.
         Note this may not find all the poles."""
 
         poles = []
-        for p, n in Ratfun(self.denominator, self.var).roots().items():
+        for p, n in Ratfun(self.denominator, self.var).roots(numeric).items():
 
             pole = Pole(p, n=n, damping=damping)
             for q in poles:
@@ -540,17 +596,22 @@ class Ratfun(object):
 
         return expr * undef
 
-    def partfrac(self, combine_conjugates=False, damping=None, split=True):
+    def partfrac(self, combine_conjugates=False, damping=None, split=True,
+                 numeric=False):
         """Convert rational function into partial fraction form.
 
         If combine_conjugates is True then the pair of partial
         fractions for complex conjugate poles are combined.
 
+        If numeric is True, the poles and residues are found
+        numerically.
+
         See also canonical, standard, general, timeconst, and ZPK
 
         """
         try:
-            Q, R, D, delay, undef = self.as_QRD(combine_conjugates, damping)
+            Q, R, D, delay, undef = self.as_QRD(combine_conjugates, damping,
+                                                numeric)
         except ValueError:
             if not split:
                 raise
@@ -559,7 +620,8 @@ class Ratfun(object):
             result = 0
             for term in self.expr.as_ordered_terms():
                 result += Ratfun(term, self.var).partfrac(combine_conjugates,
-                                                          split=False)
+                                                          split=False,
+                                                          numeric=numeric)
             return result           
 
         result = Q
@@ -617,9 +679,11 @@ class Ratfun(object):
         N = N / K
         return sym.Mul(N, sym.Pow(D, -1), evaluate=False) * sym.exp(self.var * delay) * undef
 
-    def ZPK(self):
+    def ZPK(self, numeric=False):
         """Convert to zero-pole-gain (ZPK) form.
 
+        If numeric is True, the poles and zeros are found numerically.
+
         See also canonical, general, standard, timeconst, and partfrac"""
 
         N, D, delay, undef = self.as_ratfun_delay_undef()
@@ -632,18 +696,23 @@ class Ratfun(object):
         if delay != 0:
             K *= sym.exp(self.var * delay)
 
-        zeros = sym.roots(Npoly)
-        poles = sym.roots(Dpoly)
+        if numeric:
+            zeros = _numeric_roots(Npoly)
+            poles = _numeric_roots(Dpoly)
+        else:
+            zeros = sym.roots(Npoly)
+            poles = sym.roots(Dpoly)
 
         return _zp2tf(zeros, poles, K, self.var) * undef
 
-    def residues(self, combine_conjugates=False, damping=None):
+    def residues(self, combine_conjugates=False, damping=None, numeric=False):
         """Return residues of partial fraction expansion.
 
         This is not much use without the corresponding poles.
         It is better to use as_QRD."""
 
-        Q, R, D, delay, undef = self.as_QRD(combine_conjugates, damping)
+        Q, R, D, delay, undef = self.as_QRD(combine_conjugates, damping,
+                                            numeric)
         return R
 
     def coeffs(self):
@@ -701,13 +770,21 @@ class Ratfun(object):
 
         return Q, M, D, delay, undef
         
-    def as_QRD(self, combine_conjugates=False, damping=None):
+    def as_QRD(self, combine_conjugates=False, damping=None, numeric=False):
         """Decompose expression into Q, R, D, delay, undef where
 
-        expression = (Q + sum_n R_n / D_n) * exp(-delay * var) * undef"""
+        expression = (Q + sum_n R_n / D_n) * exp(-delay * var) * undef
+
+        If numeric is True, the poles and residues are found numerically
+        using scipy.signal.residue.  This is much faster and more
+        robust for high order denominators with numeric coefficients."""
 
         Q, M, D, delay, undef = self.as_QMD()
 
+        if numeric:
+            R, D = self._as_RD_numeric(M, D, combine_conjugates)
+            return Q, R, D, delay, undef
+
         expr = M / D
         var = self.var
         
@@ -778,4 +855,63 @@ class Ratfun(object):
                         D.append(D2 ** n)                        
                                    
         return Q, R, D, delay, undef
-            
+
+    def _as_RD_numeric(self, M, D, combine_conjugates=False):
+        """Numerically find residues R and denominators D for the
+        partial fraction expansion of the strictly proper rational
+        function M / D."""
+
+        from scipy.signal import residue
+
+        var = self.var
+
+        if M == 0:
+            return [], []
+
+        b = _numeric_coeffs(sym.Poly(M, var))
+        a = _numeric_coeffs(sym.Poly(D, var))
+
+        r, p, k = residue(b, a)
+
+        # Repeated poles are listed consecutively with residues for
+        # ascending powers.
+        terms = []
+        for m, (r1, p1) in enumerate(zip(r, p)):
+            n = terms[-1][2] + 1 if m > 0 and p1 == p[m - 1] else 1
+            terms.append((r1, p1, n))
+
+        R = []
+        D = []
+        used = [False] * len(terms)
+        for m, (r1, p1, n) in enumerate(terms):
+            if used[m]:
+                continue
+            used[m] = True
+
+            pvar = var - _numeric_sympify(p1)
+
+            if combine_conjugates and not np.isclose(p1.imag, 0):
+                for m2, (r2, p2, n2) in enumerate(terms):
+                    if (not used[m2] and n2 == n and
+                        np.isclose(p2, p1.conjugate())):
+                        break
+                else:
+                    m2 = None
+
+                if m2 is not None:
+                    used[m2] = True
+                    # r1 / (s - p1)**n + r2 / (s - p2)**n
+                    num = np.polyadd(r1 * np.poly([p2] * n),
+                                     r2 * np.poly([p1] * n))
+                    num = sym.Poly([_numeric_sympify(c) for c in num],
+                                   var).as_expr()
+                    D2 = (var**2 - _numeric_sympify(2 * p1.real) * var +
+                          _numeric_sympify(abs(p1)**2))
+                    R.append(num)
+                    D.append(D2 ** n)
+                    continue
+
+            R.append(_numeric_sympify(r1))
+            D.append(pvar ** n)
+
+        return R, D
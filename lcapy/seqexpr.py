@@ -8,7 +8,44 @@ Copyright 2020 Michael Hayes, UCECE
 from .dexpr import DiscreteExpression
 from .sequence import Sequence
 from .functions import Heaviside, UnitStep, DiracDelta, UnitImpulse
-from numpy import arange
+from numpy import arange, fft
+import numpy as np
+
+
+def _unitimpulse(arg):
+    return np.where(arg == 0, 1.0, 0.0)
+
+
+def _unitstep(arg):
+    return np.where(arg >= 0, 1.0, 0.0)
+
+
+def _exp(arg):
+    # Avoid overflow for exp(-a * n) * u(n) when n is large and negative.
+    if np.iscomplexobj(arg):
+        return np.exp(np.minimum(arg.real, 500) + 1j * arg.imag)
+    return np.exp(np.minimum(arg, 500))
+
+
+sequence_func_cache = {}
+
+
+def _sequence_func(expr, var):
+    """Return lambdified function of var to evaluate expr for an array
+    of values.  The functions are cached."""
+
+    from sympy import lambdify
+
+    key = (expr, var)
+    if key in sequence_func_cache:
+        return sequence_func_cache[key]
+
+    func = lambdify(var, expr,
+                    ({'UnitImpulse' : _unitimpulse,
+                      'UnitStep' : _unitstep,
+                      'exp' : _exp}, 'numpy'))
+    sequence_func_cache[key] = func
+    return func
 
 
 class SequenceExpression(DiscreteExpression):
@@ -23,7 +60,66 @@ class SequenceExpression(DiscreteExpression):
         if self.has(DiracDelta):
             self.expr = self.replace(DiracDelta, UnitImpulse).expr
 
-    
+    def _lambdify(self):
+        """Return function of the variable to evaluate the expression for
+        an array of values."""
+
+        symbols = set([symbol.name for symbol in self.expr.free_symbols])
+        symbols -= set((self.var.name, ))
+        if symbols != set():
+            raise ValueError('Undefined symbols %s in expression %s' %
+                             (tuple(symbols), self))
+
+        return _sequence_func(self.expr, self.var)
+
+    def _evaluate_vector(self, nvals):
+        """Evaluate expression for all the values in the array nvals
+        with a single call of a lambdified function.  A ValueError is
+        raised if this is not possible."""
+
+        nvals = np.asarray(nvals, dtype=float)
+        func = self._lambdify()
+
+        try:
+            with np.errstate(all='ignore'):
+                v = np.array(func(nvals), dtype=complex)
+        except Exception as e:
+            raise ValueError('Cannot evaluate expression %s: %s' % (self, e))
+        if v.shape != nvals.shape:
+            # Have a constant.
+            v = np.broadcast_to(v, nvals.shape).copy()
+
+        if self.is_causal:
+            v[nvals < 0] = 0
+        if (v.imag == 0).all():
+            v = v.real
+        return v
+
+    def evaluate(self, arg=None):
+        """Evaluate expression at arg.  arg may be a scalar, or a vector.
+        The result is of type float or complex.  For a vector, the
+        expression is evaluated for all the values at once."""
+
+        if isinstance(arg, (tuple, list, range, np.ndarray)):
+            try:
+                return self._evaluate_vector(arg)
+            except ValueError:
+                pass
+        return super(SequenceExpression, self).evaluate(arg)
+
+    def _nonzero(self, nvals):
+        """Return array of indexes of nvals where the expression may be
+        non-zero or None if the expression cannot be evaluated
+        numerically.  Due to rounding errors, the expression may be
+        zero at some of these indexes, say cos(5 * pi / 2), so these
+        need to be checked symbolically."""
+
+        try:
+            v = self._evaluate_vector(nvals)
+        except ValueError:
+            return None
+        return np.flatnonzero(v != 0)
+
     def first_index(self, nvals=None):
 
         if nvals is None:
@@ -31,6 +127,13 @@ class SequenceExpression(DiscreteExpression):
         if isinstance(nvals, tuple):
             nvals = range(*nvals)
 
+        nz = self._nonzero(nvals)
+        if nz is not None:
+            for m in nz:
+                if self(nvals[m]) != 0:
+                    return nvals[m]
+            return nvals[-1]
+
         # Desire SymPy equivalent to argmax
         n2 = nvals[-1]
         for n in reversed(nvals):
@@ -45,6 +148,13 @@ class SequenceExpression(DiscreteExpression):
         if isinstance(nvals, tuple):
             nvals = range(*nvals)
 
+        nz = self._nonzero(nvals)
+        if nz is not None:
+            for m in reversed(nz):
+                if self(nvals[m]) != 0:
+                    return nvals[m]
+            return nvals[0]
+
         # Desire SymPy equivalent to argmin
         n1 = nvals[0]
         for n in nvals:
@@ -66,3 +176,23 @@ class SequenceExpression(DiscreteExpression):
         
         return Sequence(v, nvals, evaluate, self.var)
        
+
+    def _numeric_dft(self, N, var, inverse=False):
+        """Evaluate expression for 0, ..., N - 1 and compute DFT (or
+        inverse DFT) of the values with the FFT.  The result is a
+        sequence in the domain of var."""
+
+        if N is None:
+            raise ValueError('N needs to be specified for numeric DFT')
+        try:
+            N = int(N)
+        except TypeError:
+            raise ValueError('N must be an integer for numeric DFT, got %s' % N)
+
+        nvals = arange(N)
+        x = self.evaluate(nvals)
+        if inverse:
+            X = fft.ifft(x)
+        else:
+            X = fft.fft(x)
+        return Sequence(X, nvals, var=var)
@@ -5,23 +5,186 @@ Copyright 2020 Michael Hayes, UCECE
 """
 
 from .expr import ExprList, expr
+from .cexpr import ConstantExpression
+from math import isfinite, isnan
+import numpy as np
+import sympy as sym
 
 # Perhaps subclass numpy ndarray?  But then could not have symbolic
 # elements in the sequence.  Perhaps have flavours for n-domain and
-# k-domain sequences?
+# k-domain sequences?  For now, the values of a numeric sequence are
+# also kept as an array for numerical operations.
+
+
+def _number(v):
+    """Convert float to SymPy number.  Like sympify, finite floats are
+    converted to rationals using their string representation."""
+
+    if isfinite(v):
+        return sym.Rational(repr(v))
+    if isnan(v):
+        return sym.nan
+    return sym.oo if v > 0 else -sym.oo
+
+
+def _numeric_exprs(array):
+    """Convert array of numbers to list of constant expressions without
+    parsing each number."""
+
+    if array.dtype.kind in 'biu':
+        return [ConstantExpression(sym.Integer(v)) for v in array.tolist()]
+    if array.dtype.kind == 'c':
+        return [ConstantExpression(_number(v.real) + sym.I * _number(v.imag))
+                for v in array.tolist()]
+    return [ConstantExpression(_number(v)) for v in array.tolist()]
+
+
+def _as_array(vals):
+    """Convert sequence of numbers or numeric expressions to array.
+    A ValueError is raised if any values are symbolic."""
+
+    vals = [getattr(v, 'expr', v) for v in vals]
+    try:
+        return np.array([float(v) for v in vals])
+    except TypeError:
+        pass
+    try:
+        return np.array([complex(v) for v in vals])
+    except TypeError:
+        raise ValueError('Sequence has symbolic values')
+
+
+def _is_inexact(vals):
+    """Return True if vals is an array of floats, a sequence created
+    from an array of floats, or has float values.  Exact values are
+    filtered symbolically to avoid rounding errors."""
+
+    if isinstance(vals, Sequence):
+        return vals._inexact
+    if isinstance(vals, np.ndarray):
+        return vals.dtype.kind in 'fc'
+    for v in vals:
+        v = getattr(v, 'expr', v)
+        if isinstance(v, (float, complex, np.floating, np.complexfloating)):
+            return True
+        if isinstance(v, sym.Basic) and v.has(sym.Float):
+            return True
+    return False
+
+
+def _lfilter(b, a, x):
+    """Filter array x with the same recurrence as the exact path of
+    Sequence.lfilter, i.e., a[0] * y[n] = sum_m b[m] * x[n - m] +
+    sum_m a[m] * y[n - m] (note the sign of the feedback terms).  Like
+    the exact path, x[n - m] wraps around for n < m."""
+
+    from scipy.signal import lfilter
+
+    a = np.hstack((a[0], -a[1:]))
+    y = lfilter(b, a, x)
+
+    N = len(x)
+    w = np.zeros(N, dtype=y.dtype)
+    for m in range(1, len(b)):
+        for n in range(max(m - N, 0), min(m, N)):
+            w[n] += b[m] * x[N + n - m]
+    if w.any():
+        y = y + lfilter([1], a, w)
+    return y
+
 
 class Sequence(ExprList):
 
     def __init__(self, seq, n=None, evaluate=False, var=None):
 
+        array = None
+        if (isinstance(seq, np.ndarray) and seq.ndim == 1
+            and seq.dtype.kind in 'biufc'):
+            array = seq
+            seq = _numeric_exprs(array)
+
         super (Sequence, self).__init__(seq, evaluate)
 
+        self._array = array
+        self._inexact = array is not None and array.dtype.kind in 'fc'
+
         if n is None:
-            n = list(range(len(seq)))
-        
-        self.n = n
+            n = range(len(self))
+        elif isinstance(n, np.ndarray):
+            n = n.tolist()
+
+        self.n = list(n)
         self.var = var
 
+    # The array of values is created when required, so the list
+    # methods that modify the values need to discard it.
+
+    def append(self, value):
+        self._array = None
+        super(Sequence, self).append(value)
+
+    def extend(self, values):
+        self._array = None
+        super(Sequence, self).extend(values)
+
+    def insert(self, index, value):
+        self._array = None
+        super(Sequence, self).insert(index, value)
+
+    def pop(self, *args):
+        self._array = None
+        return super(Sequence, self).pop(*args)
+
+    def remove(self, value):
+        self._array = None
+        super(Sequence, self).remove(value)
+
+    def reverse(self):
+        self._array = None
+        super(Sequence, self).reverse()
+
+    def sort(self, **kwargs):
+        self._array = None
+        super(Sequence, self).sort(**kwargs)
+
+    def clear(self):
+        self._array = None
+        super(Sequence, self).clear()
+
+    def __setitem__(self, index, value):
+        self._array = None
+        super(Sequence, self).__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._array = None
+        super(Sequence, self).__delitem__(index)
+
+    def __iadd__(self, values):
+        self._array = None
+        return super(Sequence, self).__iadd__(values)
+
+    def __imul__(self, value):
+        self._array = None
+        return super(Sequence, self).__imul__(value)
+
+    def as_array(self):
+        """Return the values of the sequence as a NumPy array.  A
+        ValueError is raised if any of the values are symbolic."""
+
+        if self._array is None:
+            self._array = _as_array(self)
+        return self._array
+
+    @property
+    def is_numeric(self):
+        """True if all the values of the sequence are numbers."""
+
+        try:
+            self.as_array()
+            return True
+        except ValueError:
+            return False
+
     @property
     def vals(self):
         return list(self)
@@ -159,8 +322,11 @@ class Sequence(ExprList):
         
         from numpy import argwhere
 
-        # Note, each element is an Expr.
-        nz = [elt != 0 for elt in self]
+        if self._array is not None:
+            nz = self._array != 0
+        else:
+            # Note, each element is an Expr.
+            nz = [elt != 0 for elt in self]
         w = argwhere(nz)
         if len(w) == 0:
             return 0
@@ -227,12 +393,24 @@ class Sequence(ExprList):
         for the numerator and a `a` vector of coefficients for the
         denominator.
 
-        For a FIR filter a = [1]."""
+        For a FIR filter a = [1].  Note, the feedback terms are
+        added, a[0] * y[n] = sum b[m] * x[n - m] + sum a[m] * y[n - m].
+
+        If the sequence and the coefficients are numeric, and at least
+        one of them has float values, this uses scipy.signal.lfilter.
+        Otherwise, the filtering is exact."""
 
         if b is None:
             b = []
         if a is None:
             a = [1]
+
+        if _is_inexact(self) or _is_inexact(b) or _is_inexact(a):
+            try:
+                y = _lfilter(_as_array(b), _as_array(a), self.as_array())
+                return self.__class__(y, n=self.n, var=self.var)
+            except ValueError:
+                pass
         
         x = self.vals
         y = []
@@ -261,9 +439,17 @@ class Sequence(ExprList):
         return self.__class__(y, n=n, var=self.var)
     
     def convolve(self, h, mode='full'):
-        """Convolve with h."""
+        """Convolve with h.
+
+        If the sequences are numeric, and at least one of them has
+        float values, this uses scipy.signal.convolve; this chooses
+        between direct and FFT convolution.  Otherwise, the
+        convolution is exact."""
+
+        from scipy.signal import convolve
 
         x = self
+        inexact = _is_inexact(x) or _is_inexact(h)
         h = Sequence(h)
         
         Lx = x.extent()
@@ -271,11 +457,20 @@ class Sequence(ExprList):
         Ly = Lx + Lh - 1
         
         if mode == 'full':
-            x = x.zeropad(Ly - Lx)
+            M = Ly - Lx
         elif mode == 'same':
-            x = x.zeropad(max(Lx, Ly) - Lx)            
+            M = max(Lx, Ly) - Lx
         else:
             raise ValueError('Unknown mode ' + mode)
-        
-        return x.lfilter(h, a=[1])
-    
+
+        if not inexact:
+            return x.zeropad(M).lfilter(h, a=[1])
+
+        try:
+            y = convolve(x.as_array(), h.as_array())[0:len(x) + M]
+        except ValueError:
+            return x.zeropad(M).lfilter(h, a=[1])
+
+        n = x.n + list(range(x.n[-1] + 1, x.n[-1] + 1 + M))
+        return self.__class__(y, n=n, var=self.var)
+
@@ -18,6 +18,37 @@ from sympy import limit, exp, Poly, Integral, div, oo, Eq, Expr as symExpr
 __all__ = ('zp2tf', 'tf', 'pr2tf')
 
 
+def _poly_coeffs(expr, var):
+    """Return coefficients of polynomial expr in var as array of floats."""
+
+    p = Poly(expr, var)
+    if p.free_symbols - set((var, )) != set():
+        raise ValueError('Undefined symbols %s in expression %s' %
+                         (tuple(p.free_symbols - set((var, ))), expr))
+    return np.array(p.all_coeffs(), dtype=float)
+
+
+def _delay_samples(y, delay):
+    """Delay samples y by delay samples.  The whole number of samples are
+    shifted and linear interpolation is used for the remaining
+    fraction of a sample."""
+
+    Nt = len(y)
+    shift = int(np.floor(delay))
+    frac = delay - shift
+
+    if frac != 0:
+        y = (1 - frac) * y + frac * np.hstack((0, y[0:-1]))
+
+    if shift >= Nt:
+        return np.zeros(Nt)
+    elif shift > 0:
+        return np.hstack((np.zeros(shift), y[0:Nt - shift]))
+    elif shift < 0:
+        return np.hstack((y[-shift:], np.zeros(-shift)))
+    return y
+
+
 class LaplaceDomainExpression(Expr):
     """s-domain expression or symbol."""
 
@@ -161,6 +192,76 @@ class LaplaceDomainExpression(Expr):
 
         return self.transient_response(tvector)
 
+    def evaluate_time(self, tvector, method='talbot', N=None):
+        """Evaluate time-domain signal at times tvector using a numerical
+        inverse Laplace transform.  This avoids finding the symbolic
+        inverse Laplace transform and so is useful for high order or
+        non-rational expressions.
+
+        `method` can be 'talbot' or 'dehoog'.  `N` specifies the number
+        of terms used by the method.
+
+        The result is zero for t < 0 and NaN for t = 0.  Dirac deltas
+        at t = 0 are ignored.  Delays, exp(-s * T), are factored out
+        of each term of the expanded expression since the numerical
+        methods cannot handle them."""
+
+        from .numericalinverselaplace import numerical_inverse_laplace
+        from sympy import lambdify, expand, collect, Dummy
+
+        expr = self.expr
+        var = self.var
+        symbols = set([symbol.name for symbol in expr.free_symbols])
+        symbols -= set((var.name, ))
+        if symbols != set():
+            raise ValueError('Undefined symbols %s in expression %s' %
+                             (tuple(symbols), self))
+
+        tvector = np.asarray(tvector, dtype=float)
+
+        if not expr.has(exp):
+            F = lambdify(var, expr, ('numpy', 'scipy'))
+            return numerical_inverse_laplace(F, tvector, method, N)
+
+        # Replace each delay, exp(-s * T), by a dummy symbol and expand
+        # the expression so that delays inside products, such as
+        # (1 - exp(-s)) / s, become separate terms.  The terms are
+        # then grouped by delay.
+        delays = {}
+        undo = {}
+        for factor in expr.atoms(exp):
+            arg = factor.args[0]
+            if not arg.is_polynomial(var):
+                continue
+            p = Poly(arg, var)
+            if p.degree() != 1:
+                continue
+            c = p.all_coeffs()
+            d = Dummy()
+            delays[d] = -float(c[0])
+            undo[d] = exp(c[0] * var)
+            expr = expr.xreplace({factor: d * exp(c[1])})
+
+        terms = {}
+        parts = collect(expand(expr), list(delays), evaluate=False)
+        for key, rest in parts.items():
+            delay = 0
+            for d, e in key.as_powers_dict().items():
+                if d in delays and e.is_Integer and e > 0:
+                    delay += int(e) * delays[d]
+                elif d != 1:
+                    # Cannot separate delay, say in denominator.
+                    delay = 0
+                    rest = key * rest
+                    break
+            terms[delay] = terms.get(delay, 0) + rest.xreplace(undo)
+
+        result = 0
+        for delay, rest in terms.items():
+            F = lambdify(var, rest, ('numpy', 'scipy'))
+            result += numerical_inverse_laplace(F, tvector - delay, method, N)
+        return result
+
     def step_response(self, tvector=None):
         """Evaluate step response."""
 
@@ -195,54 +296,89 @@ class LaplaceDomainExpression(Expr):
 
         return X.evaluate(fvector)
 
-    def response(self, x, t):
-        """Evaluate response to input signal x at times t."""
+    def response(self, x, t, method='bilinear'):
+        """Evaluate response to input signal x at times t.
+
+        The rational part of the expression is discretized to give the
+        coefficients of an IIR filter that is applied to x.  `method`
+        specifies the discretization method; this can be 'bilinear',
+        'impulse', 'zoh', 'foh', 'euler', or 'backward_diff' (see
+        scipy.signal.cont2discrete).  The bilinear method is best for
+        high-order expressions since it is implemented with
+        second-order sections.  Delays are applied by shifting
+        the output by a whole number of samples with linear
+        interpolation for any fractional sample.  If the expression
+        is not a rational function, the sampled impulse response is
+        convolved with x using the FFT."""
+
+        from scipy.signal import cont2discrete, lfilter, sosfilt, fftconvolve
+        from scipy.signal import tf2zpk, bilinear_zpk, zpk2sos
+
+        x = np.asarray(x)
+        t = np.asarray(t)
 
         if len(x) != len(t):
             raise ValueError('x must have same length as t')
 
         dt = t[1] - t[0]
         if not np.allclose(np.diff(t), np.ones(len(t) - 1) * dt):
-            raise (ValueError, 't values not equally spaced')
-
-        # Perform polynomial long division so expr = Q + M / D                
-        N, D, delay = self._decompose()
-        Q, M = div(N, D)
-        expr = M / D
-
-        N = len(t)
+            raise ValueError('t values not equally spaced')
 
-        # Evaluate transient response.
-        th = np.arange(N) * dt - dt
-        h = LaplaceDomainExpression(expr).transient_response(th)
+        Nt = len(t)
 
-        print('Convolving...')
-        ty = t
-        y = np.convolve(x, h)[0:N] * dt
+        try:
+            N, D, delay = self._decompose()
+        except ValueError:
+            # Not a rational function, so convolve the differences of
+            # x with the step response found by numerical inverse
+            # Laplace transform.  Unlike the impulse response, this
+            # does not have a singularity at t = 0.
+            G = LaplaceDomainExpression(self.expr / self.var)
+            g = G.evaluate_time(np.arange(Nt) * dt)
+            g[0] = float(limit(self.expr, self.var, oo))
+            return fftconvolve(np.diff(x, prepend=0), g)[0:Nt]
+
+        delay = sympify(delay)
+        if delay.free_symbols != set():
+            raise ValueError('Undefined symbols %s in expression %s' %
+                             (tuple(delay.free_symbols), self))
+
+        # Perform polynomial long division so expr = Q + M / D
+        Q, M = div(N, D, self.var)
+
+        y = np.zeros(Nt)
+        if M != 0:
+            b = _poly_coeffs(M, self.var)
+            a = _poly_coeffs(D, self.var)
+            if method == 'bilinear':
+                # Use second-order sections found from the poles and
+                # zeros to avoid numerical problems with high-order
+                # filters.
+                zd, pd, kd = bilinear_zpk(*tf2zpk(b, a), fs=1 / dt)
+                y = sosfilt(zpk2sos(zd, pd, kd), x)
+            else:
+                bd, ad, _ = cont2discrete((b, a), dt, method=method)
+                y = lfilter(bd.squeeze(), ad, x)
 
-        if Q:
+        if Q != 0:
             # Handle Dirac deltas and their derivatives.
-            C = Q.all_coeffs()
-            for n, c in enumerate(C):
+            C = _poly_coeffs(Q, self.var)
+            for c in C[::-1]:
 
                 y += c * x
 
                 x = np.diff(x) / dt
                 x = np.hstack((x, 0))
 
-        from scipy.interpolate import interp1d
-
+        delay = float(delay)
         if delay != 0.0:
-            print('Interpolating...')
-            # Try linear interpolation; should oversample first...
-            y = interp1d(ty, y, bounds_error=False, fill_value=0)
-            y = y(t - delay)
+            y = _delay_samples(y, delay / dt)
 
         return y
 
     def _decompose(self):
 
-        N, D, delay = Ratfun(self, s).as_ratfun_delay()                
+        N, D, delay = Ratfun(self.expr, self.var).as_ratfun_delay()
 
         return N, D, delay
 
@@ -6,11 +6,12 @@ Copyright 2019-2020 Michael Hayes, UCECE
 """
 
 from .mnacpts import I, V, C, L
-from .matrix import Matrix
+from .matrix import Matrix, matrix_solve
 from .smatrix import LaplaceDomainMatrix
 from .tmatrix import TimeDomainMatrix
-from .sym import sympify, ssym
+from .sym import sympify, ssym, symsimplify
 import sympy as sym
+import numpy as np
 
 __all__ = ('StateSpace', )
 
@@ -29,6 +30,61 @@ __all__ = ('StateSpace', )
 # the end.
 
 
+def _state_recurrence(Phi, x, v):
+    """Fill x[..., n] = Phi x[..., n - 1] + v[..., n - 1] for n >= 1 given
+    x[..., 0].  The recurrence is evaluated in blocks of L samples
+    using the powers of Phi,
+
+    x[n + k] = Phi^k x[n] + sum_{j < k} Phi^(k - 1 - j) v[n + j],
+
+    where the sums for all the blocks are found with a single matrix
+    product.  This only leaves a Python loop over the blocks to find
+    the state at the start of each block."""
+
+    Nx, N = x.shape[-2:]
+    if N < 2:
+        return x
+
+    # Limit the size of the block Toeplitz matrix to about 2^20 elements.
+    L = max(1, min(N - 1, 128, 1024 // Nx))
+    Nb = -(-(N - 1) // L)
+    batch = x.shape[:-2]
+
+    # P[k] = Phi^k
+    P = np.zeros((L + 1, Nx, Nx))
+    P[0] = np.eye(Nx)
+    for k in range(1, L + 1):
+        P[k] = np.matmul(Phi, P[k - 1])
+
+    # Block Toeplitz matrix with T[k, j] = Phi^(k - j) for j <= k.
+    T = np.zeros((L, L, Nx, Nx))
+    for k in range(L):
+        T[k, 0:k + 1] = P[k::-1]
+    T = T.transpose(0, 2, 1, 3).reshape(L * Nx, L * Nx)
+
+    # Arrange the inputs with shape batch + (Nb, L * Nx).
+    vb = np.zeros(batch + (Nx, Nb * L))
+    vb[..., 0:N - 1] = v
+    vb = np.swapaxes(vb.reshape(batch + (Nx, Nb, L)), -3, -1)
+    vb = np.swapaxes(vb, -3, -2).reshape(batch + (Nb, L * Nx))
+
+    forced = np.matmul(vb, T.T)
+
+    # Find the state at the start of each block.
+    starts = np.zeros(batch + (Nb, Nx))
+    xn = x[..., 0]
+    PL = P[L]
+    for b in range(Nb):
+        starts[..., b, :] = xn
+        xn = np.matmul(xn, PL.T) + forced[..., b, (L - 1) * Nx:]
+
+    free = np.matmul(starts, P[1:].reshape(L * Nx, Nx).T)
+
+    xb = (free + forced).reshape(batch + (Nb * L, Nx))
+    x[..., 1:] = np.swapaxes(xb[..., 0:N - 1, :], -2, -1)
+    return x
+
+
 def _hack_vars(exprs):
     """Substitute i_Canon1(t) with i_C(t) etc. provided
     there is no i_Canon2(t)."""
@@ -44,11 +100,17 @@ def _hack_vars(exprs):
 class StateSpace(object):
     """This converts a circuit to state-space representation.
 
-    It can take a long time for a symbolic circuit with many reactive
-    components."""
+    The reactive components are replaced by sources and the MNA
+    equations for the resulting circuit are solved once for all the
+    state variables and sources."""
 
     def __init__(self, cct, node_voltages=True, branch_currents=False):
 
+        from .subnetlist import SubNetlist
+
+        # Discretized matrices keyed by time step and method.
+        self._discrete = {}
+
         if not node_voltages and not branch_currents:
             raise ValueError('No outputs')
         
@@ -83,11 +145,8 @@ class StateSpace(object):
                 
         self.cct = cct
         self.sscct = sscct
-        # sscct can be analysed in the time domain since it has no
-        # reactive components.  However, for large circuits
-        # this can take a long time due to inversion of the MNA matrix.
-        
-        dotx_exprs = []
+
+        # Determine state variables.
         statevars = []
         statenames = []
         initialvalues = []
@@ -95,18 +154,12 @@ class StateSpace(object):
             name = cpt_map[elt.name]
 
             if isinstance(elt, L):
-                # Inductors  v = L di/dt  so need v across the L
-                expr = sscct[name].v / elt.cpt.L
                 var = -sscct[name].isc
                 x0 = elt.cpt.i0
             else:
-                # Capacitors  i = C dv/dt  so need i through the C
-                # The current is negated since it is from a source V_Cx
-                expr = -sscct[name].i / elt.cpt.C
                 var = sscct[name].voc
                 x0 = elt.cpt.v0
 
-            dotx_exprs.append(expr)
             statevars.append(var)
             statenames.append(name)
             initialvalues.append(x0)
@@ -133,32 +186,56 @@ class StateSpace(object):
 
         sourcesyms = sympify(sourcenames)            
 
-        # linear_eq_to_matrix expects only Symbols and not AppliedUndefs,
-        # so substitute.
+        # Substitute symbols for the state variables and sources
+        # since these are AppliedUndefs.
         subsdict = {}
         for var, sym1 in zip(statevars, statesyms):
             subsdict[var.expr] = sym1
         for var, sym1 in zip(sourcevars, sourcesyms):
             subsdict[var.expr] = sym1       
+        self._subsdict = subsdict
+        self._syms = list(statesyms) + list(sourcesyms)
+
+        # sscct has no reactive components so its MNA equations are
+        # algebraic and can be analysed in the time domain.  The known
+        # vector is linear in the state variables and sources so the
+        # node voltages and branch currents for each of these are
+        # found with a single solve of the MNA equations.  Each
+        # voltage and current is then a row of coefficients.
+        sub = SubNetlist(sscct, 'time')
+        sub._analyse()
+        self._sub = sub
+
+        Z = sub._Z.subs(subsdict)
+        E = Z.jacobian(self._syms)
+        if (Z - E * sym.Matrix(self._syms)).expand() != sym.zeros(*Z.shape):
+            raise ValueError('Sources are not linear in the state variables')
+        self._X = matrix_solve(sub._A, E)
+
+        rows = []
+        for elt in inductors + capacitors:
+            name = cpt_map[elt.name]
 
-        for m, expr in enumerate(dotx_exprs):
-            dotx_exprs[m] = expr.subs(subsdict).expr.expand()
+            if isinstance(elt, L):
+                # Inductors  v = L di/dt  so need v across the L
+                row = self._voltage_row(name) / elt.cpt.L.expr
+            else:
+                # Capacitors  i = C dv/dt  so need i through the C
+                # The current is negated since it is from a source V_Cx
+                row = -self._current_row(name) / elt.cpt.C.expr
+            rows.append(row)
 
-        A, b = sym.linear_eq_to_matrix(dotx_exprs, *statesyms)
-        if sourcesyms != []:
-            B, b = sym.linear_eq_to_matrix(dotx_exprs, *sourcesyms)
-        else:
-            B = []
+        A, B = self._split(rows, len(statesyms))
 
         # Determine output variables.
-        yexprs = []
+        rows = []
         y = []
 
         if node_voltages:
             for node in cct.node_list:
                 if node == '0':
                     continue
-                yexprs.append(self.sscct[node].v.subs(subsdict).expand().expr)
+                rows.append(self._node_row(node))
                 # Note, this can introduce a name conflict
                 y.append(TimeDomainVoltage('v_%s(t)' % node))
 
@@ -166,15 +243,10 @@ class StateSpace(object):
             for name in cct.branch_list:
                 # Perhaps ignore L since the current through it is a
                 # state variable?
-                name2 = cpt_map[name]                    
-                yexprs.append(self.sscct[name2].i.subs(subsdict).expand().expr)
+                rows.append(self._current_row(cpt_map[name]))
                 y.append(TimeDomainCurrent('i_%s(t)' % name))                    
 
-        Cmat, b = sym.linear_eq_to_matrix(yexprs, *statesyms)
-        if sourcesyms != []:        
-            D, b = sym.linear_eq_to_matrix(yexprs, *sourcesyms)
-        else:
-            D = []
+        Cmat, D = self._split(rows, len(statesyms))
 
         # Rewrite vCanon1(t) as vC(t) etc if appropriate.
         _hack_vars(statevars)
@@ -198,6 +270,37 @@ class StateSpace(object):
         self.C = Matrix(Cmat)
         self.D = Matrix(D)
 
+    def _split(self, rows, num_states):
+        """Split rows of coefficients into the state matrix and input
+        matrix parts."""
+
+        M = symsimplify(sym.Matrix.vstack(*rows))
+        if len(self._syms) == num_states:
+            return M, []
+        return M[:, :num_states], M[:, num_states:]
+
+    def _node_row(self, node):
+        """Coefficients of node voltage."""
+
+        index = self._sub._node_index(node)
+        if index < 0:
+            return sym.zeros(1, len(self._syms))
+        return self._X[index, :]
+
+    def _voltage_row(self, name):
+        """Coefficients of voltage across component."""
+
+        elt = self._sub.elements[name]
+        return (self._node_row(elt.nodenames[0]) -
+                self._node_row(elt.nodenames[1]))
+
+    def _current_row(self, name):
+        """Coefficients of current through component."""
+
+        a, z = self._sub._cpt_current(name)
+        Z = sym.Matrix([z]).subs(self._subsdict)
+        return a * self._X - Z.jacobian(self._syms)
+
     def state_equations(self):
         """System of first-order differential state equations:
 
@@ -337,6 +440,142 @@ class StateSpace(object):
         E, L = self.A.diagonalize()
         
         return LaplaceDomainMatrix(E)
+
+    def _numeric(self):
+        """Return A, B, C, D, and x0 as arrays of floats."""
+
+        if hasattr(self, '_numeric_matrices'):
+            return self._numeric_matrices
+
+        def convert(M, rows, cols):
+
+            M = sym.Matrix(M)
+            if M.free_symbols != set():
+                raise ValueError('Undefined symbols %s in state-space matrices; use subs to replace with numerical values' % M.free_symbols)
+            return np.array(M.evalf(), dtype=float).reshape(rows, cols)
+
+        Nx, Nu, Ny = len(self.x), len(self.u), len(self.y)
+        self._numeric_matrices = (convert(self.A, Nx, Nx),
+                                  convert(self.B, Nx, Nu),
+                                  convert(self.C, Ny, Nx),
+                                  convert(self.D, Ny, Nu),
+                                  convert(self.x0, Nx, 1)[:, 0])
+        return self._numeric_matrices
+
+    def _discretize(self, dt, method):
+        """Return the state transition matrix and the input matrices
+        for the current and next input samples for time step dt.
+        These are cached for each time step."""
+
+        from scipy.linalg import expm
+
+        key = (dt, method)
+        if key in self._discrete:
+            return self._discrete[key]
+
+        A, B, C, D, x0 = self._numeric()
+        Nx, Nu = B.shape
+
+        if method == 'zoh':
+            # expm([[A, B], [0, 0]] * dt) = [[Phi, Gamma], [0, I]]
+            M = np.zeros((Nx + Nu, Nx + Nu))
+            M[0:Nx, 0:Nx] = A * dt
+            M[0:Nx, Nx:] = B * dt
+            E = expm(M)
+            Phi = E[0:Nx, 0:Nx]
+            Gamma0 = E[0:Nx, Nx:]
+            Gamma1 = np.zeros((Nx, Nu))
+        elif method == 'foh':
+            # The input is linearly interpolated between samples.
+            M = np.zeros((Nx + 2 * Nu, Nx + 2 * Nu))
+            M[0:Nx, 0:Nx] = A * dt
+            M[0:Nx, Nx:Nx + Nu] = B * dt
+            M[Nx:Nx + Nu, Nx + Nu:] = np.eye(Nu)
+            E = expm(M)
+            Phi = E[0:Nx, 0:Nx]
+            Gamma1 = E[0:Nx, Nx + Nu:]
+            Gamma0 = E[0:Nx, Nx:Nx + Nu] - Gamma1
+        else:
+            raise ValueError('Unknown method %s, expecting zoh or foh' % method)
+
+        self._discrete[key] = Phi, Gamma0, Gamma1
+        return self._discrete[key]
+
+    def simulate(self, u=None, tv=None, x0=None, method='zoh'):
+        """Numerically simulate the state-space model at the uniformly
+        spaced times in the vector `tv`.
+
+        `u` is an array of input samples with shape (Nu, N), where Nu
+        is the number of inputs and N is the number of times.  If
+        there is a single input, it can have shape (N, ).  Additional
+        leading dimensions are treated as a batch of input signals
+        that are simulated together.  If `u` is None, the input
+        vector `u` is evaluated at the times `tv`.
+
+        `x0` is the initial state vector; this defaults to the
+        initial values of the state variables.
+
+        `method` is 'zoh' if the input is held constant between
+        samples or 'foh' if the input is linearly interpolated
+        between samples.  The model is discretized using the matrix
+        exponential; this is exact for inputs that satisfy these
+        assumptions.  The discretized matrices are cached for each
+        time step.
+
+        This returns the output vector y and the state vector x with
+        shapes (Ny, N) and (Nx, N).  All the symbols, apart from t,
+        need to be replaced with numerical values (using the subs
+        method of the circuit).  Here's an example of use:
+
+        ss = cct.ss
+        t = np.linspace(0, 1, 100)
+        y, x = ss.simulate(tv=t)
+        """
+
+        if tv is None:
+            raise ValueError('Time vector tv not specified')
+        tv = np.asarray(tv, dtype=float)
+        N = len(tv)
+
+        A, B, C, D, x0default = self._numeric()
+        Nx, Nu = B.shape
+
+        if u is None:
+            u = np.zeros((Nu, N))
+            for m, u1 in enumerate(self.u):
+                u[m] = TimeDomainExpression(u1).evaluate(tv)
+        u = np.asarray(u, dtype=float)
+        if u.ndim == 1:
+            u = u.reshape(1, -1)
+        if u.shape[-2:] != (Nu, N):
+            raise ValueError('Expecting input with shape (%d, %d), got %s' %
+                             (Nu, N, u.shape))
+
+        if x0 is None:
+            x0 = x0default
+        x0 = np.asarray(x0, dtype=float)
+
+        batch = u.shape[:-2]
+        x = np.zeros(batch + (Nx, N))
+        x[..., 0] = x0
+
+        if N > 1:
+            dt = tv[1] - tv[0]
+            if not np.allclose(np.diff(tv), dt):
+                raise ValueError('Time vector tv is not uniformly spaced')
+
+            Phi, Gamma0, Gamma1 = self._discretize(dt, method)
+
+            # The contributions of the inputs are found for all the
+            # time steps at once leaving only the recurrence.
+            v = np.matmul(Gamma0, u[..., 0:-1])
+            if method == 'foh':
+                v += np.matmul(Gamma1, u[..., 1:])
+
+            _state_recurrence(Phi, x, v)
+
+        y = np.matmul(C, x) + np.matmul(D, u)
+        return y, x
     
     
 from .symbols import t, s
@@ -17,6 +17,7 @@ from sympy import Basic, Symbol, Expr, Atom
 from sympy.core.function import AppliedUndef
 import sympy as sym
 import re
+from keyword import iskeyword
 from .state import state
 from .simplify import simplify_dirac_delta, simplify_heaviside
 
@@ -35,6 +36,18 @@ for _symbol in excludes:
     global_dict.pop(_symbol)
 
     
+# Patterns for the common cases of a plain number or a single name.
+# These are handled without calling the SymPy parser.
+number_pattern = re.compile(r'(0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?$')
+name_pattern = re.compile(r'[A-Za-z]\w*$')
+
+
+def _is_simple_name(name):
+
+    return (name_pattern.match(name) is not None and not iskeyword(name)
+            and name not in global_dict and name != 'omega0')
+
+
 def capitalize_name(name):
 
     return name[0].upper() + name[1:]
@@ -67,6 +80,11 @@ def symbols_find(arg):
         return ([(NUMBER, '0')])
 
     if isinstance(arg, str):
+        if number_pattern.match(arg):
+            return symbols
+        if _is_simple_name(arg):
+            return [arg]
+
         parse_expr(arg, transformations=(find_symbol, ), 
                    global_dict=global_dict, local_dict={}, evaluate=False)
         
@@ -88,6 +106,16 @@ def parse(string, symbols=None, evaluate=True, local_dict=None, **assumptions):
     
     cache = assumptions.pop('cache', True)
 
+    if number_pattern.match(string):
+        return sym.Rational(string)
+
+    if (_is_simple_name(string) and string not in local_dict
+        and string != 'ivp'):
+        s = Symbol(string, **assumptions)
+        if cache and string not in symbols:
+            symbols[string] = s
+        return s
+
     def auto_symbol(tokens, local_dict, global_dict):
         """Inserts calls to ``Symbol`` or ``Function`` for undefined variables/functions."""
         result = []
@@ -1,5 +1,5 @@
 from lcapy import Circuit, R, C, L, V, I, v, exp, Heaviside, LaplaceDomainVoltage, AngularFourierDomainNoiseVoltage, TimeDomainVoltage, TimeDomainCurrent, sqrt, u, sympify, expr
-from lcapy import LaplaceDomainImpedance, s, t
+from lcapy import LaplaceDomainImpedance, LaplaceDomainAdmittance, s, t, omega0
 import unittest
 import sympy as sym
 
@@ -580,6 +580,42 @@ class LcapyTester(unittest.TestCase):
         self.assertEqual(expr(Z[1, 0]), expr('R2'), "Z21")
         self.assertEqual(expr(Z[1, 1]), expr('R1 + R2'), "Z22")
 
+        Y = a.Yparams(3, 0, 1, 0)
+        self.assertEqual(expr(Y[0, 1]), expr('-R2 / (R1 * R2 + R1 * R3 + R2 * R3)'), "Y12")
+        self.assertEqual((Y * Z).simplify(), sym.eye(2), "Y * Z")
+
+    def test_params_nport(self):
+
+        a = Circuit("""
+        R1 1 2;
+        R2 2 0;
+        C1 2 3;
+        L1 3 0""")
+
+        Y = a.Yparamsn(1, 0, 2, 0, 3, 0)
+        Z = a.Zparamsn(1, 0, 2, 0, 3, 0)
+        self.assertEqual((Y * Z).simplify(), sym.eye(3), "Y * Z")
+        self.assertTrue(isinstance(Y[0, 1], LaplaceDomainAdmittance),
+                        "Yparamsn type")
+        self.assertTrue(isinstance(Z[0, 1], LaplaceDomainImpedance),
+                        "Zparamsn type")
+
+        # A-parameters of a voltage divider (series R1, shunt R2).
+        b = Circuit("""
+        R1 1 2
+        R2 2 0""")
+        A = b.Aparams(1, 0, 2, 0)
+        self.assertEqual(expr(A[0, 1]), expr('R1'), "A12")
+        self.assertEqual(expr(A[1, 0]), expr('1 / R2'), "A21")
+
+        # Shunt element has Z-parameters but no Y-parameters.
+        c = Circuit("""
+        R1 1 0""")
+        A = c.Aparams(1, 0, 1, 0)
+        self.assertEqual(expr(A[0, 1]), 0, "A12 shunt")
+        self.assertEqual(expr(A[1, 0]), expr('1 / R1'), "A21 shunt")
+        self.assertRaises(ValueError, c.Yparams, 1, 0, 1, 0)
+
     def test_in_series(self):
 
         a = Circuit("""
@@ -626,3 +662,321 @@ class LcapyTester(unittest.TestCase):
 
         self.assertEqual(b.impedance(1, 2), a.impedance(1, 2), "simplify parallel")        
         
+
+    def test_Vdict_time(self):
+
+        a = Circuit("""
+        V1 1 0 step 10
+        R1 1 2 2
+        L1 2 3 3
+        C1 3 0 4
+        R2 3 0 5""")
+
+        Vdict = a.Vdict.time()
+        for node in ('1', '2', '3'):
+            self.assertEqual(Vdict[node], a[node].V(t), "Vdict time %s" % node)
+
+        Idict = a.Idict.time()
+        self.assertEqual(Idict['R1'], a.R1.I(t), "Idict time R1")
+
+        a = Circuit("""
+        V1 1 0 step 10
+        R1 1 2 R
+        L1 2 0 L""")
+
+        Vdict = a.Vdict.time()
+        self.assertEqual(Vdict['2'], a[2].V(t), "Vdict time symbolic")
+
+    def test_copy(self):
+
+        a = Circuit("""
+        V1 1 0 10; down
+        R1 1 2; right
+        W 2 3
+        C1 3 0 2""")
+
+        b = a.copy()
+        self.assertEqual(str(b), str(a), "copy netlist")
+        self.assertIsNot(b.R1, a.R1, "copy cpt")
+        self.assertIs(b.R1.cct, b, "copy cpt cct")
+        self.assertIsNot(b.R1.opts, a.R1.opts, "copy opts")
+
+        b.add('W 3 4')
+        self.assertEqual(len(b.elements), len(a.elements) + 1, "copy anon")
+
+        # b is parsed in the same context as its copies.
+        C1 = b.C1.cpt
+        c = b.subs({'R1': 7})
+        self.assertIs(c.C1.cpt, C1, "subs shared cpt")
+        self.assertEqual(c.R1.R, 7, "subs R1")
+
+    def test_netfile_add(self):
+
+        import os
+        import tempfile
+
+        lines = ['V1 1 0 10'] + ['R%d %d %d 2' % (m, m, m + 1)
+                                 for m in range(1, 20)] + ['R20 20 0 {R + 1}']
+        fd, filename = tempfile.mkstemp(suffix='.sch')
+        with os.fdopen(fd, 'w') as f:
+            f.write('\n'.join(lines))
+
+        a = Circuit(filename)
+        os.remove(filename)
+        self.assertEqual(len(a.elements), 21, "netfile elements")
+        self.assertEqual(a.R20.R, expr('R + 1'), "netfile R20")
+        self.assertEqual(a.R3.R, 2, "netfile R3")
+
+        fd, filename = tempfile.mkstemp(suffix='.sch')
+        with os.fdopen(fd, 'w') as f:
+            f.write('R21 20 0 3')
+        b = a.subs({'R': 2})
+        I1 = b.V1.I
+        b.netfile_add(filename)
+        os.remove(filename)
+        self.assertEqual(list(b.elements)[-1], 'R21', "netfile order")
+        self.assertNotEqual(b.V1.I, I1, "netfile_add invalidates")
+
+    def test_incremental(self):
+
+        net = """
+        V1 1 0 dc 10
+        R1 1 2 2
+        R2 2 0 4
+        R3 2 3 1
+        R4 3 0 3"""
+
+        a = Circuit(net)
+        a[3].V
+        a.add('R5 1 3 6')
+        self.assertTrue(hasattr(a, '_sub'), "incremental add")
+        b = Circuit(net + '\nR5 1 3 6')
+        self.assertEqual(a[3].V, b[3].V, "incremental add V3")
+        self.assertEqual(a.R5.I, b.R5.I, "incremental add I")
+
+        sub = list(a._sub.values())[0]
+        self.assertTrue(hasattr(sub, '_Ainv'), "incremental inverse")
+        a.add('R7 2 3 5')
+        self.assertEqual(a[3].V, Circuit(net + '\nR5 1 3 6\nR7 2 3 5')[3].V,
+                         "incremental add V3 second")
+
+        a.remove('R5')
+        a.remove('R7')
+        self.assertTrue(hasattr(a, '_sub'), "incremental remove")
+        self.assertEqual(a[3].V, Circuit(net)[3].V, "incremental remove V3")
+
+        net2 = net.replace('dc 10', 'dc V')
+        a = Circuit(net2)
+        a[3].V
+        a.add('R5 1 3 6')
+        a.add('R7 2 3 5')
+        self.assertEqual(a[3].V, Circuit(net2 + '\nR5 1 3 6\nR7 2 3 5')[3].V,
+                         "incremental symbolic source")
+
+        a = Circuit(net.replace('R3 2 3 1', 'R3 2 3 R'))
+        a[3].V
+        a.add('R5 1 3 6')
+        sub = list(a._sub.values())[0]
+        self.assertFalse(hasattr(sub, '_Ainv'), "incremental symbolic")
+        self.assertEqual(a[3].V, Circuit(net.replace('R3 2 3 1', 'R3 2 3 R') +
+                                         '\nR5 1 3 6')[3].V,
+                         "incremental symbolic V3")
+
+        a.add('R6 3 4 1')
+        self.assertFalse(hasattr(a, '_sub'), "new node")
+
+        # Mix incremental updates with full analyses.
+        net3 = net + '\nC1 3 0 2'
+        a = Circuit(net3)
+        a[3].V
+        a.add('R5 1 3 6')
+        self.assertTrue(hasattr(a, '_sub'), "incremental add with C")
+        a.add('L1 2 3 1')
+        self.assertFalse(hasattr(a, '_sub'), "full analysis for L")
+        a[3].V
+        a.add('R7 2 0 5')
+        self.assertTrue(hasattr(a, '_sub'), "incremental add after L")
+        b = Circuit(net3 + '\nR5 1 3 6\nL1 2 3 1\nR7 2 0 5')
+        self.assertEqual(a[3].V, b[3].V, "mixed V3")
+        self.assertEqual(a.is_dc, b.is_dc, "mixed analysis")
+        a.remove('L1')
+        self.assertFalse(hasattr(a, '_sub'), "full analysis for L removal")
+        a[3].V
+        a.add('R2 2 0 8')
+        self.assertFalse(hasattr(a, '_sub'), "full analysis for override")
+        b = Circuit(net3.replace('R2 2 0 4', 'R2 2 0 8') +
+                    '\nR5 1 3 6\nR7 2 0 5')
+        self.assertEqual(a[3].V, b[3].V, "mixed V3 after override")
+
+    def test_driving_point(self):
+
+        a = Circuit("""
+        V1 1 0 {10 + 3 * u(t)}
+        R1 1 2 3
+        C1 2 0 4
+        R2 2 3 5
+        L1 3 0 2""")
+
+        Z = (3 * (2 * s + 5) / (2 * (12 * s**2 + 31 * s + 4)))
+        self.assertEqual(a.impedance(2, 0), Z, "impedance")
+        self.assertEqual(a.admittance(2, 0), 1 / Z, "admittance")
+        self.assertEqual(a.impedance(1, 3), 4 * s * (15 * s + 2) /
+                         (12 * s**2 + 31 * s + 4), "impedance 1 3")
+        self.assertEqual(a.Isc(2, 0).dc, expr('10 / 3'), "Isc dc")
+        self.assertEqual(a.Isc(2, 0).s, 1 / s, "Isc s")
+        self.assertEqual(a.norton(2, 0).Isc, a.Isc(2, 0), "norton")
+        self.assertEqual(str(a.impedance(2, 0)),
+                         '(s/4 + 5/8)/(s**2 + 31*s/12 + 1/3)',
+                         "impedance form")
+        self.assertEqual(str(a.admittance(2, 0)),
+                         '(4*s**2 + 31*s/3 + 4/3)/(s + 5/2)',
+                         "admittance form")
+
+        b = Circuit("""
+        V1 1 0 ac 5
+        R1 1 2 3
+        C1 2 0 4""")
+        self.assertEqual(str(b.Isc(1, 2)[omega0]), '20*j*omega_0',
+                         "Isc ac cancelled")
+
+        c = Circuit("""
+        R1 1 2 R1
+        C1 2 0 C1
+        L1 2 0 L1""")
+        self.assertEqual(str(c.impedance(1, 0)),
+                         '(R1*s**2 + s/C1 + R1/(C1*L1))/(s**2 + 1/(C1*L1))',
+                         "symbolic impedance form")
+
+        a.add('R3 2 0 7')
+        self.assertEqual(a.impedance(2, 0), 1 / (1 / Z + expr('1 / 7')),
+                         "impedance after add")
+
+    def test_equipotential_nodes(self):
+
+        a = Circuit("""
+        V1 1 0 dc 10
+        W 1 1a
+        R1 1a 2 2
+        W 0 0_1
+        R2 2 0_1 4""")
+
+        self.assertEqual(a.equipotential_nodes,
+                         {'0': ['0', '0_1'], '1': ['1', '1a'], '2': ['2']},
+                         "equipotential nodes")
+        self.assertEqual(a.node_list, ['0', '1', '2'], "node_list")
+        self.assertEqual(a.branch_list, ['V1', 'R1', 'R2'], "branch_list")
+
+        a.add('W3 2 2a')
+        a.add('R3 2a 0 4')
+        self.assertEqual(a.node_map['2a'], '2', "node_map after add")
+        self.assertEqual(a.branch_list, ['V1', 'R1', 'R2', 'R3'],
+                         "branch_list after add")
+
+        a.remove('W3')
+        self.assertEqual(a.node_list, ['0', '1', '2', '2a'],
+                         "node_list after remove")
+
+        a = Circuit("""
+        V1 1 0 10
+        R1 1 2 2
+        R2 2 3 3
+        R3 3 0 5
+        C1 3 0 1""")
+        a.equipotential_nodes
+        b = a.simplify_series()
+        W = [elt for elt in b.elements.values() if elt.type == 'W'][0]
+        self.assertEqual(len(b.equipotential_nodes), 3,
+                         "equipotential nodes after simplify")
+        self.assertEqual(b.node_map[W.nodenames[0]],
+                         b.node_map[W.nodenames[1]], "node_map after simplify")
+
+    def test_cpt_attributes(self):
+
+        a = Circuit("""
+        a.R1 1 2 5; right
+        R2 1 2""")
+
+        R1 = a.elements['a.R1']
+        self.assertEqual(R1.namespace, 'a.', "namespace")
+        self.assertEqual(R1.relname, 'R1', "relname")
+        self.assertEqual(R1.relnodes, ['1', '2'], "relnodes")
+        self.assertEqual(R1.opts, {'right': ''}, "opts")
+        self.assertEqual(R1.classname, 'R', "classname")
+        self.assertFalse(hasattr(R1, '__dict__'), "slots")
+
+        R2 = a.R2
+        self.assertEqual(R2.namespace, '', "namespace R2")
+        self.assertEqual(R2.relnodes, ('1', '2'), "relnodes R2")
+        self.assertEqual(R2.args, ('R2', ), "default arg")
+        self.assertEqual(R2.explicit_args, (), "explicit args")
+
+        self.assertIsNone(R2._cpt, "lazy cpt")
+        b = a.copy()
+        self.assertIsNone(b.R2._cpt, "lazy clone cpt")
+        self.assertEqual(b.R2.R, expr('R2'), "clone cpt")
+        c = b.copy()
+        self.assertIs(c.R2.cpt, b.R2.cpt, "shared cpt")
+
+        import gc
+        import weakref
+        e = Circuit("""
+        R1 1 2
+        C1 2 0""")
+        ref = weakref.ref(e)
+        d = e.copy()
+        del e
+        gc.collect()
+        self.assertIsNone(ref(), "clone keeps source netlist")
+
+    def test_symbols(self):
+
+        from lcapy.state import state
+
+        a = Circuit("""
+        Vx 1 0 {Vx}
+        Rfoo 1 2
+        Cbar 2 0""")
+        for name in ('Vx', 'Rfoo', 'Cbar'):
+            self.assertIn(name, a.symbols, "symbol %s" % name)
+            self.assertNotIn(name, state.global_context.symbols,
+                             "global symbol %s" % name)
+
+        a = Circuit("""
+        D1 1 2
+        R1 2 0 R
+        V1 1 0 5""")
+        self.assertIn('R', a.symbols, "symbols with diode")
+
+    def test_namespace_reduction(self):
+
+        from lcapy import config
+        from lcapy.mna import _schur_reduce
+
+        lines = ['V1 1 0 10', 'W 1 c1.in']
+        for k in range(1, 4):
+            lines += ['c%d.R1 in m 1' % k, 'c%d.R2 m 0 2' % k,
+                      'c%d.R3 m out 3' % k, 'W c%d.0 0' % k]
+            if k < 3:
+                lines.append('W c%d.out c%d.in' % (k, k + 1))
+        lines.append('RL c3.out 0 5')
+        net = '\n'.join(lines)
+
+        a = Circuit(net)
+        try:
+            config.namespace_reduction = True
+            _schur_reduce.cache_clear()
+            b = Circuit(net)
+            self.assertEqual(b['c3.out'].V, a['c3.out'].V, "port voltage")
+            self.assertEqual(b['c2.m'].V, a['c2.m'].V, "internal voltage")
+            self.assertEqual(b['c1.R2'].I, a['c1.R2'].I, "internal current")
+            info = _schur_reduce.cache_info()
+            self.assertEqual(info.misses, 1, "cached blocks")
+            self.assertTrue(info.hits >= 2, "reused blocks")
+
+            c = Circuit(net)
+            c.add('R4 1 0 7')
+            self.assertEqual(c['c3.out'].V, b['c3.out'].V, "unchanged port")
+            self.assertEqual(_schur_reduce.cache_info().misses, 1,
+                             "blocks reused across netlists")
+        finally:
+            config.namespace_reduction = False
@@ -627,6 +627,24 @@ class LcapyTester(unittest.TestCase):
 
         self.assertEqual(F.partfrac(), F,  "undef delay sum partfrac")
         self.assertEqual(F.partfrac(True), F,  "undef delay sum partfrac")
+
+    def test_partfrac_numeric(self):
+
+        H = 10 / ((s + 1) * (s + 2) * (s**2 + 2 * s + 5) * (s + 7)**2)
+
+        poles = sorted([p.cval for p in H.poles(aslist=True, numeric=True)],
+                       key=lambda p: (round(p.real, 6), p.imag))
+        expected = [-7, -7, -2, -1 - 2j, -1, -1 + 2j]
+        for p1, p2 in zip(poles, expected):
+            self.assertAlmostEqual(p1, p2, 6, "numeric poles")
+        self.assertEqual(sum(H.poles(numeric=True).values()), 6,
+                         "numeric pole multiplicity")
+
+        for G in (H.partfrac(numeric=True),
+                  H.partfrac(combine_conjugates=True, numeric=True),
+                  H.ZPK(numeric=True)):
+            self.assertAlmostEqual(G.evaluate(1.5), H.evaluate(1.5), 12,
+                                   "numeric partfrac")
         
 
     def test_mixedfrac(self):
@@ -734,3 +752,88 @@ class LcapyTester(unittest.TestCase):
 
         a = PhasorExpression(-3 + 4j, omega=7)
         self.assertEqual(a.magnitude, 5, 'magnitude')                        
+
+    def test_matrix_solve(self):
+
+        from lcapy.matrix import matrix_solve
+        import sympy as sym
+
+        x, y = sym.symbols('x y')
+        A = sym.Matrix(((1 / x + s, -s, 1), (-s, s + 1 / (y * s), 0),
+                        (1, 0, 0)))
+        b = sym.Matrix((0, 0, 1 / s))
+
+        x1 = matrix_solve(A, b, method='DM-bareiss')
+        x2 = matrix_solve(A, b, method='ADJ')
+        self.assertEqual((x1 - x2).applyfunc(sym.simplify),
+                         sym.zeros(3, 1), 'DM-bareiss')
+
+        A = sym.Matrix(((1, 2), (2, 4)))
+        self.assertRaises(ValueError, matrix_solve, A, sym.Matrix((1, 0)),
+                          method='DM-bareiss')
+
+        A = sym.Matrix(((s, sym.Float(2.5)), (1, x)))
+        x1 = matrix_solve(A, sym.Matrix((1, 0)), method='DM-bareiss')
+        self.assertFalse(x1.has(sym.Float), 'DM-bareiss float')
+
+    def test_matrix_solve_float_cpt(self):
+
+        import sympy as sym
+
+        a = Circuit("""
+        V1 1 0 step 10
+        R1 1 2
+        C 2 0
+        E1 3 0 2 0 2.5
+        R2 3 0 1""")
+        self.assertFalse(a[3].V(s).expr.has(sym.Float), 'exact VCVS result')
+        self.assertEqual(a[3].V(s), a[2].V(s) * 5 / 2, 'VCVS gain')
+
+    def test_matrix_inverse_auto(self):
+
+        from lcapy.matrix import matrix_inverse, matrix_inverse_profile
+        import sympy as sym
+
+        x, y = sym.symbols('x y')
+        A = sym.Matrix(((x, 1), (1, y)))
+        Ainv = matrix_inverse(A, method='auto')
+        self.assertEqual((Ainv * A).applyfunc(sym.simplify), sym.eye(2),
+                         'auto')
+        self.assertTrue(len(matrix_inverse_profile) > 0, 'profile')
+
+        A = sym.Matrix(((1, 2), (3, 4)))
+        self.assertEqual(matrix_inverse(A, method='auto'), A.inv(), 'numeric')
+
+        from lcapy.matrix import MatrixInverseTimeout, _matrix_inverse_timed
+
+        class TimeoutMatrix(sym.MutableDenseMatrix):
+
+            def inv(self, *args, **kwargs):
+                raise MatrixInverseTimeout('timeout')
+
+        A = TimeoutMatrix(((1, 2), (3, 4)))
+        for method in ('GE', 'DM-charpoly'):
+            self.assertRaises(MatrixInverseTimeout, matrix_inverse, A,
+                              method=method)
+        self.assertRaises(MatrixInverseTimeout, _matrix_inverse_timed, A,
+                          'GE')
+        self.assertEqual(matrix_inverse_profile[('GE', 2)]['timeouts'], 1,
+                         'profile timeouts')
+
+        from lcapy.matrix import matrix_inverse_methods, matrix_solve
+
+        A = sym.Matrix(((x, 1, 0), (1, y, 0), (0, 0, 1)))
+        methods = matrix_inverse_methods(A)
+        matrix_inverse_profile[(methods[0], 3)] = {'calls': 0, 'time': 0.0,
+                                                   'timeouts': 1}
+        matrix_inverse_profile[(methods[2], 3)] = {'calls': 1, 'time': 0.1,
+                                                   'timeouts': 0}
+        self.assertEqual(matrix_inverse_methods(A),
+                         [methods[2], methods[1], methods[0]],
+                         'profile ordering')
+        for key in ((methods[0], 3), (methods[2], 3)):
+            del matrix_inverse_profile[key]
+
+        b = sym.Matrix((1, 2, 3))
+        self.assertEqual((A * matrix_solve(A, b, method='auto')).applyfunc(
+            sym.simplify), b, 'solve auto')
@@ -1,6 +1,9 @@
 from lcapy import *
 from lcapy.discretetime import *
+from lcapy.dft import DFTmatrix, IDFTmatrix
 import unittest
+import sympy as sym
+import numpy as np
 
 
 class LcapyTester(unittest.TestCase):
@@ -31,3 +34,35 @@ class LcapyTester(unittest.TestCase):
 
         self.assertEqual(nexpr('2 * exp(-j * 2 * pi * n / N)').DFT(), 
                          kexpr('2 * N * delta(k - 1)'), "2 * exp(-j * 2 * pi * n / N)")
+
+    def test_DFT_numeric(self):
+
+        X = nexpr('delta(n) + 2 * delta(n - 1)').DFT(4, numeric=True)
+        self.assertTrue(np.allclose(X.as_array(), [3, 1 - 2j, -1, 1 + 2j]),
+                        "numeric DFT")
+        self.assertEqual(X[1], expr('1 - 2 * j'), "numeric DFT value")
+
+        x = kexpr('4 * delta(k)').IDFT(4, numeric=True)
+        self.assertEqual(x.vals, [1, 1, 1, 1], "numeric IDFT")
+
+        x = nexpr('exp(-n / 10) * u(n)')
+        X = x.DFT(16, numeric=True)
+        self.assertTrue(np.allclose(X.as_array(),
+                                    np.fft.fft(np.exp(-np.arange(16) / 10))),
+                        "numeric DFT of exp")
+        self.assertIsNotNone(X._array, "numeric DFT array-backed")
+
+        X = x.DFT(4096, numeric=True)
+        self.assertIsNotNone(X._array, "large numeric DFT array-backed")
+        self.assertEqual(len(X), 4096, "large numeric DFT length")
+
+    def test_DFTmatrix(self):
+
+        W = DFTmatrix(4)
+        self.assertEqual(W[1, 3], sym.I, "DFTmatrix element")
+        self.assertEqual(IDFTmatrix(4) * W, sym.eye(4), "IDFTmatrix")
+        W[0, 0] = 2
+        self.assertEqual(DFTmatrix(4)[0, 0], 1, "cached DFTmatrix modified")
+
+        from lcapy.dft import dft_matrix_cache
+        self.assertIn((4, False), dft_matrix_cache, "DFTmatrix cached")
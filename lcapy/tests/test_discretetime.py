@@ -1,7 +1,9 @@
 from lcapy import *
 from lcapy.discretetime import *
+from lcapy.sequence import Sequence
 import unittest
 import sympy as sym
+import numpy as np
 
 
 class LcapyTester(unittest.TestCase):
@@ -16,3 +18,95 @@ class LcapyTester(unittest.TestCase):
 
         self.assertEqual(a(z), 1, "ui(n)")
         
+
+    def test_sequence_filter(self):
+
+        x = seq((1, 2, 3))
+        self.assertTrue(x.is_numeric, "is_numeric")
+        self.assertEqual(x.convolve((1, 1)).vals, [1, 3, 5, 3], "convolve")
+        self.assertEqual(x.lfilter((1, ), (1, -0.5)).vals,
+                         [1, expr('3 / 2'), expr('9 / 4')], "lfilter")
+
+        x = Sequence((expr('a'), 2, 3))
+        self.assertFalse(x.is_numeric, "symbolic is_numeric")
+        self.assertEqual(x.convolve((1, 1)).vals,
+                         [expr('a'), expr('a + 2'), 5, 3], "symbolic convolve")
+        self.assertEqual(x.lfilter((1, ), (1, -expr('1 / 2'))).vals,
+                         [expr('a'), expr('2 - a / 2'), expr('a / 4 + 2')],
+                         "symbolic lfilter")
+
+        x = Sequence(np.arange(100) * 0.25)
+        self.assertTrue(np.allclose(x.as_array(), np.arange(100) * 0.25),
+                        "as_array")
+        y = x.convolve(np.ones(3))
+        self.assertTrue(np.allclose(y.as_array(),
+                                    np.convolve(np.arange(100) * 0.25,
+                                                np.ones(3))), "convolve array")
+        self.assertIsNotNone(y._array, "convolve array-backed")
+        self.assertIsNotNone(x.lfilter((1, ), (1, -0.5))._array,
+                        "lfilter array-backed")
+
+        x = Sequence(np.array([1e-20, np.nan, -np.inf]))
+        self.assertEqual(len(x), 3, "array len")
+        self.assertEqual(x[0], expr('1e-20'), "array getitem")
+        self.assertEqual(x.vals[2].expr, -sym.oo, "inf value")
+        self.assertTrue(x.vals[1].expr is sym.nan, "nan value")
+
+        x = Sequence(np.array([1, 2, 3]))
+        self.assertEqual(x, Sequence(np.array([1, 2, 3])), "array equality")
+        self.assertIn(2, x, "array contains")
+        self.assertEqual(list(reversed(x)), [3, 2, 1], "array reversed")
+        x.append(expr(4))
+        self.assertEqual(x.vals, [1, 2, 3, 4], "array append")
+        self.assertTrue(np.allclose(x.as_array(), [1, 2, 3, 4]),
+                        "as_array after append")
+
+    def test_sequence_filter_exact(self):
+
+        x = seq((1, 2, 3))
+        self.assertEqual(x.lfilter((1, ), (3, )).vals,
+                         [expr('1 / 3'), expr('2 / 3'), 1], "exact lfilter")
+        self.assertEqual(x.convolve((expr('1 / 3'), )).vals,
+                         [expr('1 / 3'), expr('2 / 3'), 1], "exact convolve")
+        self.assertEqual(x.lfilter((1, ), (1, -expr('1 / 3'))).vals,
+                         [1, expr('5 / 3'), expr('22 / 9')],
+                         "exact recursive lfilter")
+
+        # The feedback coefficients are added and x[n - m] wraps
+        # around for n < m; the array path must match.
+        y = [expr('17 / 2'), expr('59 / 4'), expr('147 / 8')]
+        self.assertEqual(x.lfilter((1, 2, 3, 4), (2, 1)).vals, y,
+                         "exact lfilter convention")
+        x = Sequence(np.array([1., 2., 3.]))
+        self.assertTrue(np.allclose(x.lfilter((1, 2, 3, 4), (2, 1)).as_array(),
+                                    [8.5, 14.75, 18.375]),
+                        "array lfilter convention")
+
+    def test_evaluate_vector(self):
+
+        x = nexpr('exp(-n / 10) * u(n)')
+        nv = np.arange(-5, 5)
+        v = x.evaluate(nv)
+        self.assertTrue(np.allclose(v, [x(m).evaluate() for m in nv]),
+                        "evaluate vector")
+        from lcapy.seqexpr import sequence_func_cache
+        self.assertIn((x.expr, x.var), sequence_func_cache,
+                      "lambdified function cached")
+        self.assertEqual(x.first_index((-100, 100)), 0, "first_index")
+        self.assertEqual(x.last_index((-100, 100)), 99, "last_index")
+        self.assertEqual(nexpr('exp(-n) * u(n)').last_index((-100, 100)), 99,
+                         "last_index small values")
+        x = nexpr('cos(pi * n / 2) * u(n)')
+        self.assertEqual(x.last_index((-5, 6)), 4, "last_index rounding")
+        self.assertEqual(x.first_index((-5, 6)), 0, "first_index rounding")
+        self.assertTrue(np.iscomplexobj(nexpr('1e-14 * j * delta(n)').evaluate(nv)),
+                        "evaluate small imaginary part")
+
+        y = delta(n) + 2 * delta(n - 2)
+        self.assertTrue(np.allclose(y.evaluate(nv), 1 * (nv == 0) +
+                                    2 * (nv == 2)), "evaluate impulses")
+        self.assertEqual(y.extent(), 3, "extent")
+        self.assertEqual(nexpr(3).evaluate((1, 2)).tolist(), [3, 3],
+                         "evaluate constant")
+        self.assertEqual(nexpr('a * delta(n - 1)').seq().vals, [expr('a')],
+                         "symbolic seq")
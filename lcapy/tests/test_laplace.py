@@ -2,6 +2,7 @@ from lcapy import *
 from lcapy.laplace import inverse_laplace_ratfun
 import unittest
 import sympy as sym
+import numpy as np
 
 
 class LcapyTester(unittest.TestCase):
@@ -80,5 +81,53 @@ class LcapyTester(unittest.TestCase):
         h = H(t)
         H2 = h(s)
 
-        self.assertEqual(H, H2, "second derivative of undef")                
-        
+        self.assertEqual(H, H2, "second derivative of undef")
+
+    def test_evaluate_time(self):
+
+        tv = np.array([-1, 0.1, 0.5, 1, 2])
+        for method in ('talbot', 'dehoog'):
+            v = (1 / (s + 2)).evaluate_time(tv, method=method)
+            self.assertTrue(np.allclose(v, np.exp(-2 * tv) * (tv > 0),
+                                        atol=1e-7), "evaluate_time %s" % method)
+
+            v = (1 / sqrt(s)).evaluate_time(tv[1:], method=method)
+            self.assertTrue(np.allclose(v, 1 / np.sqrt(np.pi * tv[1:]),
+                                        atol=1e-7), "evaluate_time sqrt")
+
+            tv2 = tv + 0.25
+            v = (exp(-s) / (s + 1)).evaluate_time(tv2, method=method)
+            self.assertTrue(np.allclose(v, np.exp(1 - tv2) * (tv2 > 1),
+                                        atol=1e-7), "evaluate_time delay")
+
+            v = ((1 - exp(-s)) / s).evaluate_time([0.5, 1.5, 2.5],
+                                                  method=method)
+            self.assertTrue(np.allclose(v, [1, 0, 0], atol=1e-7),
+                            "evaluate_time delay in product")
+
+
+    def test_response(self):
+
+        tv = np.arange(1000) * 1e-3
+        x = np.ones(len(tv))
+
+        y = (1 / (s + 2)).response(x, tv, method='zoh')
+        self.assertTrue(np.allclose(y, 0.5 * (1 - np.exp(-2 * tv))),
+                        "response zoh")
+
+        y = ((s + 3) / (s + 2)).response(x, tv)
+        self.assertTrue(np.allclose(y, 1.5 - 0.5 * np.exp(-2 * tv),
+                                    atol=1e-3), "response bilinear")
+
+        y = (exp(-s / 10) / (s + 2)).response(x, tv, method='zoh')
+        td = tv - 0.1
+        self.assertTrue(np.allclose(y, 0.5 * (1 - np.exp(-2 * td)) * (td >= 0)),
+                        "response delay")
+
+        y = (1 / sqrt(s + 1)).response(x, tv)
+        from scipy.special import erf
+        self.assertTrue(np.allclose(y, erf(np.sqrt(tv)), atol=1e-6),
+                        "response non-rational")
+
+        H = exp(-s * symbol('T')) / (s + 1)
+        self.assertRaises(ValueError, H.response, x, tv)
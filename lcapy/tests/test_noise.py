@@ -103,3 +103,55 @@ class LcapyTester(unittest.TestCase):
         a = AngularFourierDomainNoiseVoltage(2 * omega)
         b = AngularFourierDomainNoiseVoltage(3 + omega)
         
+
+    def test_sample(self):
+
+        import numpy as np
+
+        a = AngularFourierDomainNoiseVoltage(3)
+        fs = 1000
+        blocks = a.sample_blocks(fs, blocksize=1000, seed=1)
+        y1 = np.concatenate([next(blocks) for m in range(50)])
+        self.assertTrue(abs(np.std(y1) / (3 * np.sqrt(fs / 2)) - 1) < 0.05,
+                        "sample_blocks rms")
+
+        blocks = a.sample_blocks(fs, blocksize=250, seed=1)
+        y2 = np.concatenate([next(blocks) for m in range(8)])
+        self.assertTrue(np.allclose(y1[0:2000], y2), "sample_blocks seed")
+
+        for blocksize in (1, 5):
+            blocks = a.sample_blocks(fs, blocksize=blocksize, seed=1)
+            y3 = np.concatenate([next(blocks) for m in range(100 // blocksize)])
+            self.assertTrue(np.allclose(y1[0:100], y3),
+                            "sample_blocks small blocksize %d" % blocksize)
+
+        t = np.arange(101) / fs
+        self.assertTrue(np.allclose(a.sample(t, seed=2), a.sample(t, seed=2)),
+                        "sample seed")
+        self.assertEqual(len(a.sample(t)), 101, "sample odd length")
+
+        t = np.arange(20001) / fs
+        y = a.sample(t, seed=3)
+        self.assertEqual(len(y), 20001, "sample length")
+        self.assertTrue(abs(np.std(y) / (3 * np.sqrt(fs / 2)) - 1) < 0.05,
+                        "sample rms")
+
+    def test_rms_numeric(self):
+
+        a = Circuit()
+        a.add('V1 1 0 noise 3')
+        a.add('R1 1 2 2')
+        a.add('C1 2 0 4')
+        Vn = a.C1.V.n
+        self.assertAlmostEqual(float(Vn.rms(numeric=True).expr),
+                               float(Vn.rms().expr.evalf()), 6, "rms numeric")
+        self.assertAlmostEqual(float(Vn.rms(0, 1, numeric=True).expr),
+                               float(Vn.rms(0, 1).expr.evalf()), 6,
+                               "rms numeric bandwidth")
+
+        b = AngularFourierDomainNoiseVoltage(3)
+        self.assertEqual(b.rms(numeric=True).expr, oo, "rms numeric white")
+        self.assertAlmostEqual(float(b.rms(fmax=100, numeric=True).expr), 30,
+                               6, "rms numeric white bandwidth")
+        with self.assertWarns(UserWarning, msg="integrate numeric converge"):
+            b._integrate_numeric(fmax=100, rtol=-1)
@@ -68,6 +68,24 @@ def test_Vquotes():
     
     assert_equals(type(parse('V1 1 2 "a * 5"')), schemcpts.classes['V'], 'Class not V')
 
+def test_split():
+    '''Test splitting of fields'''
+
+    from lcapy.parser import split
+
+    assert_equals(split('R1  1\t2 (5)', grammar.delimiters),
+                  ['R1', '1', '2', '5'], 'split')
+    assert_equals(split('R1 1 2 {a * 5}', grammar.delimiters),
+                  ['R1', '1', '2', '{a * 5}'], 'split braces')
+
+def test_tables():
+    '''Test parsing tables are shared'''
+
+    parser2 = Parser(schemcpts, grammar)
+    assert parser2.tables is parser.tables, 'Tables not shared'
+    assert_equals(type(parse('E1 1 2 opamp 3 4 A')).__name__, 'Eopamp',
+                  'Class not Eopamp')
+
 # def test_opamp():
 #     '''Test opamp'''
 #    
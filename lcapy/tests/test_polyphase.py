@@ -16,3 +16,28 @@ class LcapyTester(unittest.TestCase):
         alpha = polyphase_alpha(3)
         
         V = PhaseVoltageVector((A, A * alpha, A * alpha**2))
+
+    def test_polyphase_numeric(self):
+
+        import numpy as np
+
+        for N in (3, 4):
+            A = polyphase_decompose_matrix(N, expand=True).evalf()
+            self.assertTrue(np.allclose(np.array(A, dtype=complex),
+                                        polyphase_decompose_matrix(N, numeric=True)),
+                            "numeric decompose matrix")
+
+        from lcapy.polyphase import _numeric_matrix, numeric_matrix_cache
+        self.assertFalse(_numeric_matrix('compose', 3).flags.writeable,
+                         "numeric matrix read-only")
+        self.assertIn(('compose', 3), numeric_matrix_cache,
+                      "numeric matrix cached")
+
+        x = np.arange(12).reshape(4, 3) * (1 + 2j)
+        S = polyphase_decompose(x)
+        self.assertTrue(np.allclose(S, np.fft.fft(x, axis=1) / 3),
+                        "polyphase_decompose")
+        self.assertTrue(np.allclose(polyphase_compose(S), x),
+                        "polyphase_compose")
+        self.assertTrue(np.allclose(phase_to_line(x), x - np.roll(x, -1, 1)),
+                        "phase_to_line")
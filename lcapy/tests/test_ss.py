@@ -1,4 +1,5 @@
 from lcapy import Circuit, expr
+from lcapy.statespace import StateSpace
 import unittest
 import sympy as sym
 
@@ -67,3 +68,114 @@ class LcapyTester(unittest.TestCase):
         self.assertEqual2(expr(ss.D[1]), expr(1), "Incorrect D[1] matrix element")
         self.assertEqual2(expr(ss.eigenvalues[0]), expr('-R1 / L1'), "Incorrect eigenvalues")
         
+
+    def test_VRCLR(self):
+        """Lcapy: check VRCLR circuit
+
+        """
+        a = Circuit("""
+        V1 1 0
+        R1 1 2
+        C1 2 0
+        L1 2 3
+        R2 3 0""")
+
+        ss = a.ss
+
+        self.assertEqual(ss.A.shape, (2, 2), "Incorrect A matrix shape")
+        self.assertEqual2(expr(ss.x[0]), expr('i_L1(t)'), "Incorrect state variable1")
+        self.assertEqual2(expr(ss.x[1]), expr('v_C1(t)'), "Incorrect state variable2")
+        self.assertEqual2(expr(ss.A[0, 0]), expr('-R2 / L1'), "Incorrect A[0, 0]")
+        self.assertEqual2(expr(ss.A[0, 1]), expr('1 / L1'), "Incorrect A[0, 1]")
+        self.assertEqual2(expr(ss.A[1, 0]), expr('-1 / C1'), "Incorrect A[1, 0]")
+        self.assertEqual2(expr(ss.A[1, 1]), expr('-1 / (R1 * C1)'), "Incorrect A[1, 1]")
+        self.assertEqual2(expr(ss.B[1]), expr('1 / (R1 * C1)'), "Incorrect B matrix")
+        self.assertEqual2(expr(ss.C[2, 0]), expr('R2'), "Incorrect C[2, 0]")
+
+    def test_IRLC_branch_currents(self):
+        """Lcapy: check IRLC circuit branch currents
+
+        """
+        a = Circuit("""
+        I1 1 0
+        R1 1 0
+        L1 1 2
+        C1 2 0""")
+
+        ss = StateSpace(a, node_voltages=False, branch_currents=True)
+
+        self.assertEqual2(expr(ss.u[0]), expr('i1(t)'), "Incorrect input")
+        self.assertEqual2(expr(ss.B[0]), expr('R1 / L1'), "Incorrect B matrix")
+        # Current through R1
+        self.assertEqual2(expr(ss.C[1, 0]), expr(-1), "Incorrect C[1, 0]")
+        self.assertEqual2(expr(ss.D[1]), expr(1), "Incorrect D[1]")
+
+    def test_VCCS_Z_branch_currents(self):
+        """Lcapy: check branch currents for controlled source and impedance
+
+        """
+        a = Circuit("""
+        V1 1 0
+        R1 1 2 2
+        C1 2 0 3
+        G2 3 0 2 0 g
+        R3 3 0 4
+        Z1 2 4 5
+        L1 4 0 7""")
+
+        ss = StateSpace(a, node_voltages=False, branch_currents=True)
+
+        # Current through G2 is g v_C1(t).
+        self.assertEqual2(expr(ss.C[3, 0]), expr(0), "Incorrect C[3, 0]")
+        self.assertEqual2(expr(ss.C[3, 1]), expr('g'), "Incorrect C[3, 1]")
+        self.assertEqual2(expr(ss.D[3]), expr(0), "Incorrect D[3]")
+        # Current through Z1 is i_L1(t).
+        self.assertEqual2(expr(ss.C[5, 0]), expr(1), "Incorrect C[5, 0]")
+        self.assertEqual2(expr(ss.C[5, 1]), expr(0), "Incorrect C[5, 1]")
+
+    def test_simulate(self):
+        """Lcapy: check state-space simulation
+
+        """
+        import numpy as np
+
+        a = Circuit("""
+        V1 1 0 step 10
+        R1 1 2 1000
+        C1 2 0 1e-6""")
+
+        ss = a.ss
+        tv = np.linspace(0, 5e-3, 101)
+        y, x = ss.simulate(tv=tv)
+        self.assertEqual(y.shape, (2, 101), "Incorrect output shape")
+        vC = 10 * (1 - np.exp(-tv / 1e-3))
+        self.assertTrue(np.allclose(x[0], vC), "Incorrect zoh state")
+        self.assertTrue(np.allclose(y[1], vC), "Incorrect zoh output")
+
+        u = np.ones((2, 1, 101)) * 10
+        u[1] *= 2
+        y, x = ss.simulate(u, tv, method='foh')
+        self.assertEqual(y.shape, (2, 2, 101), "Incorrect batch shape")
+        self.assertTrue(np.allclose(y[1, 1], 2 * vC), "Incorrect foh output")
+        self.assertEqual(len(ss._discrete), 2, "Discretized matrices not cached")
+
+        self.assertRaises(ValueError, ss.simulate, None, tv ** 2)
+
+    def test_state_recurrence(self):
+        """Lcapy: check block evaluation of state recurrence
+
+        """
+        import numpy as np
+        from lcapy.statespace import _state_recurrence
+
+        Phi = np.array([[0.9, 0.2, 0], [-0.2, 0.8, 0.1], [0, 0.1, 0.5]])
+        v = np.sin(np.arange(2 * 3 * 499).reshape(2, 3, 499))
+        x = np.zeros((2, 3, 500))
+        x[..., 0] = [[1, 2, 3], [-1, 0, 1]]
+
+        xr = x.copy()
+        for n in range(1, 500):
+            xr[..., n] = np.matmul(xr[..., n - 1], Phi.T) + v[..., n - 1]
+
+        _state_recurrence(Phi, x, v)
+        self.assertTrue(np.allclose(x, xr), "Incorrect state recurrence")
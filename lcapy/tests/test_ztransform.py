@@ -2,6 +2,7 @@ from lcapy import *
 from lcapy.discretetime import *
 import unittest
 import sympy as sym
+import numpy as np
 
 
 class LcapyTester(unittest.TestCase):
@@ -64,3 +65,77 @@ class LcapyTester(unittest.TestCase):
         d = expr('Sum(a(-m + n)*b(m), (m, 0, n))')
         
         self.assertEqual(c, d, "convolution")
+
+    def test_response(self):
+
+        H = 1 / (1 - z**-1 / 2)
+        y = H.response(np.ones(5), np.arange(5))
+        self.assertTrue(np.allclose(y, 2 - 0.5 ** np.arange(5)), "response")
+
+        H = z**-1 + 2 * z**-2
+        y = H.response(np.array([1, 0, 0, 0]), np.arange(4))
+        self.assertTrue(np.allclose(y, [0, 1, 2, 0]), "response FIR")
+
+        H = z**-2 / (1 - z**-1 / 2)**3
+        y = H.response(np.array([1, 0, 0, 0, 0, 0]), np.arange(6))
+        self.assertTrue(np.allclose(y, [0, 0, 1, 1.5, 1.5, 1.25]),
+                        "response delayed IIR")
+
+        H = dt / (1 - z**-1)
+        y = H.response(np.ones(4), np.arange(4) * 0.5)
+        self.assertTrue(np.allclose(y, [0.5, 1, 1.5, 2]), "response dt")
+
+        H = 1 / (1 - z**-1 / 2)
+        self.assertRaises(ValueError, H.response, np.ones(3), [0, 1, 3])
+
+        H = 1 + z
+        y = H.response(np.ones(4), np.arange(4))
+        self.assertEqual(len(y), 4, "response fallback")
+
+    def test_filter(self):
+
+        x = np.cos(np.arange(200) * 0.3)
+        H = 1 / ((1 - z**-1 / 2)**2 * (1 - z**-1 * 9 / 10)**2)
+        y1 = H.filter(x)
+        y2 = H.filter(x, chunksize=7)
+        self.assertTrue(np.allclose(y1, y2), "filter chunks")
+        from lcapy.zexpr import filter_coeffs_cache
+        self.assertIn((H.expr, H.var), filter_coeffs_cache,
+                      "filter coefficients cached")
+
+        zi = 0
+        y3 = []
+        for block in np.split(x, 8):
+            y, zi = H.filter(block, zi)
+            y3.append(y)
+        self.assertTrue(np.allclose(y1, np.concatenate(y3)), "filter state")
+
+        H = 1 + 2 * z**-1
+        y, zf = H.filter(np.array([1, 1]), 0)
+        self.assertTrue(np.allclose(y, [1, 3]), "filter FIR")
+        self.assertTrue(np.allclose(zf, [2]), "filter FIR state")
+
+        x = np.zeros(5)
+        x[0] = 1
+        H = 3 * z**-1 / (1 - z**-1 / 2)**2
+        self.assertTrue(np.allclose(H.filter(x), [0, 3, 3, 2.25, 1.5]),
+                        "filter delayed IIR")
+        H = z**-2 / (1 - z**-1 / 2)
+        self.assertTrue(np.allclose(H.filter(x), [0, 0, 1, 0.5, 0.25]),
+                        "filter delayed first-order IIR")
+
+        x = np.cos(np.arange(200) * 0.3)
+        H1 = 1 / (1 - z**-1 / 2)**3
+        H2 = z**-3 * H1
+        y1 = H1.filter(x)
+        y2 = H2.filter(x)
+        self.assertTrue(np.allclose(y2[:3], 0), "filter delay")
+        self.assertTrue(np.allclose(y2[3:], y1[:-3]), "filter delayed")
+
+        zi = 0
+        y3 = []
+        for block in np.split(x, 100):
+            y, zi = H2.filter(block, zi)
+            y3.append(y)
+        self.assertTrue(np.allclose(y2, np.concatenate(y3)),
+                        "filter delayed state")
@@ -14,7 +14,64 @@ from .dexpr import DiscreteExpression
 from .expr import symbol, expr, ExprDict
 from .functions import sqrt, exp
 import numpy as np
-from sympy import Eq, div, limit, oo, Sum
+from sympy import Eq, div, limit, oo, Sum, Poly
+
+
+filter_coeffs_cache = {}
+
+
+def _filter_coeffs(expr, var):
+    """Return tuple (sos, b, a) of the coefficients of the difference
+    equation for expr.  sos is an array of second-order sections for
+    IIR filters of order greater than two, otherwise it is None and
+    the b and a coefficients are used.  The coefficients are
+    cached."""
+
+    from scipy.signal import tf2zpk, zpk2sos
+    from .sexpr import _poly_coeffs
+
+    key = (expr, var)
+    if key in filter_coeffs_cache:
+        return filter_coeffs_cache[key]
+
+    N, D, delay = Ratfun(expr, var).as_ratfun_delay()
+    if delay != 0:
+        raise ValueError('Cannot handle non-rational expression %s' % expr)
+
+    # Convert to polynomials in z^-1.
+    b = _poly_coeffs(N, var)
+    a = _poly_coeffs(D, var)
+    if len(b) > len(a):
+        raise ValueError('Expression %s is not causal' % expr)
+    b = np.hstack((np.zeros(len(a) - len(b)), b))
+
+    # Remove the leading zeros of b as a delay of shift samples and
+    # the trailing zeros of b and a (poles and zeros at the origin).
+    shift = 0
+    if b.any():
+        shift = np.flatnonzero(b)[0]
+        b = np.trim_zeros(b[shift:], 'b')
+    a = np.trim_zeros(a, 'b')
+
+    sos = None
+    if len(a) > 3:
+        # Use second-order sections found from the poles and zeros
+        # to avoid numerical problems with high-order IIR filters.
+        # tf2zpk strips leading zeros of b so the delay is applied
+        # with additional sections.
+        M = max(len(a), len(b))
+        sos = zpk2sos(*tf2zpk(np.hstack((b, np.zeros(M - len(b)))),
+                              np.hstack((a, np.zeros(M - len(a))))))
+        delays = [[0, 0, 1, 1, 0, 0]] * (shift // 2)
+        if shift % 2:
+            delays.append([0, 1, 0, 1, 0, 0])
+        if delays != []:
+            sos = np.vstack((sos, delays))
+
+    b = np.hstack((np.zeros(shift), b))
+    result = sos, b, a
+    filter_coeffs_cache[key] = result
+    return result
 
 
 class ZDomainExpression(DiscreteExpression):
@@ -118,53 +175,113 @@ class ZDomainExpression(DiscreteExpression):
         return X.evaluate(fvector)
 
     def response(self, x, t):
-        """Evaluate response to input signal x at times t."""
+        """Evaluate response to input signal x at times t.  The
+        expression is converted to the coefficients of a difference
+        equation that is used to filter x.  If this is not possible,
+        the impulse response is convolved with x."""
+
+        x = np.asarray(x)
+        t = np.asarray(t)
 
         if len(x) != len(t):
             raise ValueError('x must have same length as t')
 
-        dt = t[1] - t[0]
-        if not np.allclose(np.diff(t), np.ones(len(t) - 1) * dt):
-            raise (ValueError, 't values not equally spaced')
+        Dt = t[1] - t[0]
+        if not np.allclose(np.diff(t), np.ones(len(t) - 1) * Dt):
+            raise ValueError('t values not equally spaced')
+
+        H = self
+        if H.has(dt):
+            H = H.subs(dt, Dt)
+
+        try:
+            return H.filter(x)
+        except ValueError:
+            pass
 
-        # Perform polynomial long division so expr = Q + M / D                
-        N, D, delay = self._decompose()
-        Q, M = div(N, D)
+        N, D, delay = H._decompose()
+        Q, M = div(N, D, H.var)
         expr = M / D
 
         N = len(t)
+        th = np.arange(N) * Dt - Dt
 
-        # Evaluate transient response.
-        th = np.arange(N) * dt - dt
-        h = ZDomainExpression(expr).transient_response(th)
-
-        print('Convolving...')
-        ty = t
-        y = np.convolve(x, h)[0:N] * dt
+        y = np.zeros(N)
+        if expr != 0:
+            h = ZDomainExpression(expr).transient_response(th)
+            y = np.convolve(x, h)[0:N] * Dt
 
         if Q:
-            # Handle Dirac deltas and their derivatives.
-            C = Q.all_coeffs()
+            C = np.array(Poly(Q, H.var).all_coeffs(), dtype=float)
             for n, c in enumerate(C):
-
                 y += c * x
-
-                x = np.diff(x) / dt
+                x = np.diff(x) / Dt
                 x = np.hstack((x, 0))
 
         from scipy.interpolate import interp1d
 
         if delay != 0.0:
-            print('Interpolating...')
-            # Try linear interpolation; should oversample first...
-            y = interp1d(ty, y, bounds_error=False, fill_value=0)
+            y = interp1d(t, y, bounds_error=False, fill_value=0)
             y = y(t - delay)
 
         return y
 
+    def filter(self, x, zi=None, chunksize=None):
+        """Filter the array x using the difference equation for the
+        expression.  The coefficients are found once and cached.
+
+        If zi is None, the filter starts at rest and the filtered
+        array is returned.  Otherwise, zi is the filter state (use 0
+        for a filter at rest) and the tuple (y, zf) is returned, where
+        zf is the final filter state.  This allows a data stream to be
+        filtered block by block, for example,
+
+        >>> zi = 0
+        >>> for block in blocks:
+        ...     y, zi = H.filter(block, zi)
+
+        If chunksize is specified, x is filtered in chunks of this
+        many samples with the filter state passed between chunks."""
+
+        from scipy.signal import lfilter, sosfilt
+
+        x = np.asarray(x)
+        sos, b, a = _filter_coeffs(self.expr, self.var)
+
+        if sos is not None:
+            zshape = (sos.shape[0], 2)
+        else:
+            zshape = (max(len(a), len(b)) - 1, )
+
+        return_state = zi is not None
+        if zi is None or np.isscalar(zi) and zi == 0:
+            zi = np.zeros(zshape, dtype=np.result_type(x, float))
+        elif np.shape(zi) != zshape:
+            raise ValueError('Filter state has shape %s, expecting %s' %
+                             (np.shape(zi), zshape))
+
+        if chunksize is None:
+            chunksize = max(len(x), 1)
+
+        y = []
+        for m in range(0, len(x), chunksize):
+            chunk = x[m:m + chunksize]
+            if sos is not None:
+                ychunk, zi = sosfilt(sos, chunk, zi=zi)
+            elif len(zi) == 0:
+                ychunk = b[0] / a[0] * chunk
+            else:
+                ychunk, zi = lfilter(b, a, chunk, zi=zi)
+            y.append(ychunk)
+
+        y = np.concatenate(y) if y != [] else np.zeros(0)
+        if return_state:
+            return y, zi
+        return y
+
     def _decompose(self):
 
-        N, D, delay = Ratfun(self, z).as_ratfun_delay()                
+        N, D, delay = Ratfun(self.expr, self.var).as_ratfun_delay()
 
         return N, D, delay
 